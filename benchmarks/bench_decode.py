@@ -0,0 +1,75 @@
+"""Benchmark dekodowania wierszy tasks -> Task (czas i pamięć).
+
+Porównuje ścieżkę sqlite3.Row + _row_to_task z fabryką _task_factory.
+Uruchomienie: python benchmarks/bench_decode.py [liczba_zadań]
+"""
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database as db  # noqa: E402
+from models import Task, STATUSES, PRIORITIES  # noqa: E402
+
+
+def _fill(n: int) -> None:
+    rnd = random.Random(42)
+    start = date.today() - timedelta(days=60)
+    db.add_tasks([
+        Task(
+            title=f"Zadanie {i}",
+            status=rnd.choice(STATUSES),
+            priority=rnd.choice(PRIORITIES),
+            description="opis " * rnd.randint(0, 10),
+            deadline=start + timedelta(days=rnd.randint(0, 120)) if rnd.random() < 0.7 else None,
+        )
+        for i in range(n)
+    ])
+
+
+def _decode_rows() -> list[Task]:
+    with db.connection() as conn:
+        rows = conn.execute(f"SELECT {db._TASK_COLUMNS} FROM tasks ORDER BY id").fetchall()
+        return [db._row_to_task(r) for r in rows]
+
+
+def _decode_factory() -> list[Task]:
+    with db.connection() as conn:
+        return db._fetch_tasks(conn, f"SELECT {db._TASK_COLUMNS} FROM tasks ORDER BY id")
+
+
+def _measure(fn, repeat: int = 3) -> tuple[float, float]:
+    best = min(_timed(fn) for _ in range(repeat))
+    tracemalloc.start()
+    result = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, size / 1e6
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        db.init_db()
+        _fill(n)
+        for name, fn in (("Row + _row_to_task", _decode_rows), ("_task_factory", _decode_factory)):
+            seconds, mb = _measure(fn)
+            print(f"{name:<22} {n} zadań: {seconds * 1000:8.1f} ms, {mb:6.1f} MB")
+        db.close_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Benchmark gorących ścieżek aplikacji na syntetycznych tablicach.
+
+Uruchomienie:
+    python benchmarks/run.py --sizes 1000 10000 100000 --out results.json
+    python benchmarks/run.py --sizes 1000000 --no-app          # bez AppTest
+    python benchmarks/run.py --sizes 10000 --boards 100        # 100 tablic po 10k zadań
+    python benchmarks/run.py --compare old.json new.json --threshold 0.2
+
+Rozmiar to liczba zadań mierzonej (domyślnej) tablicy; przy --boards N
+baza ma N takich tablic. Wyniki trafiają do JSON: {"meta": {...}, "results": {"nazwa@rozmiar": {...}}}.
+Tryb --compare porównuje medianę czasu i zwraca kod 1, gdy któryś pomiar
+zwolnił o więcej niż próg.
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import database as db  # noqa: E402
+import synthetic  # noqa: E402
+from models import STATUSES, DEFAULT_BOARD_ID  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def _time(fn: Callable[[], object], repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "repeat": repeat,
+    }
+
+
+def _bench_size(size: int, repeat: int, with_app: bool, boards: int = 1) -> dict:
+    # Importy komponentów dopiero tutaj - Streamlit działa w trybie "bare"
+    from components import board, sidebar
+
+    db.DB_PATH = synthetic.board_path(size, boards=boards)
+    db.close_connections()
+    db.init_db()
+
+    board_id = DEFAULT_BOARD_ID
+    tasks = db.get_all_tasks.__wrapped__(board_id)
+    with db.connection() as conn:
+        rows = conn.execute(
+            f"SELECT {db._TASK_COLUMNS} FROM tasks WHERE board_id = ?", (board_id,)
+        ).fetchall()
+    today = date.today()
+    filters = {
+        "board_id": board_id,
+        "priority": ["Wysoki", "Średni"],
+        "hide_done": True,
+        "search": "",
+        "today": today,
+    }
+    overdue = {"board_id": board_id, "deadline": "overdue", "today": today}
+    columns = {
+        s: db.get_tasks_page(board_id, filters, s, limit=board.COLUMN_PAGE_SIZE)[0]
+        for s in STATUSES
+    }
+
+    cases: dict[str, Callable[[], object]] = {
+        "get_all_tasks.cold": lambda: db.get_all_tasks.__wrapped__(board_id),
+        "get_all_tasks.cached": lambda: db.get_all_tasks(board_id),
+        "_row_to_task": lambda: [db._row_to_task(r) for r in rows],
+        "board._apply_filters": lambda: board._apply_filters(tasks, filters),
+        "board._build_sortable_items": lambda: board._build_sortable_items(columns, today),
+        "get_tasks_page.cold": lambda: [
+            db.get_tasks_page.__wrapped__(board_id, filters, s, limit=board.COLUMN_PAGE_SIZE)
+            for s in STATUSES
+        ],
+        "load_task_table.cold": lambda: db._read_task_table(board_id),
+        "get_stats.cold": lambda: db.get_stats.__wrapped__(board_id, today),
+        "count_due.cold": lambda: db.count_due.__wrapped__(board_id, today),
+        "get_flow.cold": lambda: db.get_flow.__wrapped__(board_id, today),
+        "get_cycle_times.cold": lambda: db.get_cycle_times.__wrapped__(board_id, today),
+        "get_tasks_page.overdue.cold": lambda: [
+            db.get_tasks_page.__wrapped__(board_id, overdue, s, limit=board.COLUMN_PAGE_SIZE)
+            for s in STATUSES
+        ],
+        "sidebar._render_stats": lambda: sidebar._render_stats(db.get_stats(board_id)),
+    }
+    if with_app:
+        cases.update(_app_cases())
+
+    label = f"{size}x{boards}" if boards > 1 else str(size)
+    results = {}
+    for name, fn in cases.items():
+        results[f"{name}@{label}"] = _time(fn, repeat)
+        print(f"{name:<32} {label:>9}  {results[f'{name}@{label}']['median_ms']:10.2f} ms")
+    return results
+
+
+def _app_cases() -> dict[str, Callable[[], object]]:
+    from streamlit.testing.v1 import AppTest
+
+    def first_run() -> None:
+        at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=600).run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+    app = AppTest.from_file(str(ROOT / "app.py"), default_timeout=600)
+
+    def rerun() -> None:
+        app.run()
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+
+    return {"app.first_run": first_run, "app.rerun": rerun}
+
+
+def compare(old_path: Path, new_path: Path, threshold: float) -> int:
+    old = json.loads(old_path.read_text())["results"]
+    new = json.loads(new_path.read_text())["results"]
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key]["median_ms"], new[key]["median_ms"]
+        ratio = after / before if before else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  <-- REGRESJA"
+            regressions += 1
+        print(f"{key:<44} {before:10.2f} -> {after:10.2f} ms  ({ratio:5.2f}x){flag}")
+    print(f"\n{regressions} regresji (próg {threshold:.0%})")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", type=Path, default=Path("benchmarks/results.json"))
+    parser.add_argument("--boards", type=int, default=1, help="liczba tablic w bazie")
+    parser.add_argument("--no-app", action="store_true", help="pomiń przebiegi AppTest")
+    parser.add_argument("--compare", type=Path, nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+
+    results = {}
+    for size in args.sizes:
+        results.update(_bench_size(size, args.repeat, with_app=not args.no_app, boards=args.boards))
+
+    args.out.write_text(json.dumps({
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "boards": args.boards,
+        },
+        "results": results,
+    }, indent=2))
+    print(f"\nZapisano {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Pomiar zimnego startu: import modułów aplikacji i pierwszy rerun (first paint).
+
+Każdy pomiar to osobny proces Pythona, więc moduły nie są współdzielone
+między próbami. Uruchomienie:
+    python benchmarks/startup.py [--repeat 5] [--size 1000] [--root ŚCIEŻKA] [--out plik.json]
+
+`--root` pozwala zmierzyć inną kopię repozytorium (np. starszy commit
+w `git worktree`) na tej samej syntetycznej bazie.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import synthetic  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import streamlit
+import database, components.sidebar, components.board
+print((time.perf_counter() - start) * 1000)
+"""
+
+_FIRST_PAINT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=600).run()
+assert not at.exception, at.exception
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def _measure(snippet: str, env: dict, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", snippet],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "repeat": repeat}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--root", type=Path, default=ROOT)
+    parser.add_argument("--out", type=Path)
+    args = parser.parse_args()
+
+    root = str(args.root.resolve())
+    env = {**os.environ, "KANBAN_DB": str(synthetic.board_path(args.size))}
+    results = {
+        "import": _measure(_IMPORT_SNIPPET.format(root=root), env, args.repeat),
+        "first_paint": _measure(
+            _FIRST_PAINT_SNIPPET.format(root=root, app=str(Path(root) / "app.py")), env, args.repeat
+        ),
+    }
+    for name, result in results.items():
+        print(f"{name:<12} median {result['median_ms']:8.1f} ms  (min {result['min_ms']:.1f} ms)")
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Test obciążeniowy zapisów: wiele "sesji" (wątków) zapisujących naraz.
+
+Porównuje dwie ścieżki na kopii syntetycznej bazy:
+  direct - każde wywołanie to osobna transakcja z własnym commitem
+           (dawne zachowanie mutatorów: `with connection() as conn, conn:`),
+  writer - mutatory przez wątek zapisu z grupowym commitem (db.*).
+
+Uruchomienie:
+    python benchmarks/stress_writes.py [--sessions 16] [--ops 200] [--size 10000]
+"""
+import argparse
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import database as db  # noqa: E402
+import synthetic  # noqa: E402
+from models import STATUSES, DEFAULT_BOARD_ID  # noqa: E402
+
+
+def _direct(op):
+    """Wywołanie z osobną transakcją na połączeniu z puli (bez wątku zapisu)."""
+    def call(*args):
+        with db.connection() as conn, conn:
+            return op.__wrapped__(conn, *args)
+    return call
+
+
+def _run(mode: str, sessions: int, ops: int, task_ids: list[int], seed: int) -> dict:
+    if mode == "direct":
+        move, edit = _direct(db.update_task_status), _direct(db.update_task)
+    else:
+        move, edit = db.update_task_status, db.update_task
+    tasks = {t.id: t for t in db.get_all_tasks(DEFAULT_BOARD_ID)}
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(sessions)
+
+    def session(n: int) -> None:
+        rnd = random.Random(seed + n)
+        own_latencies, own_errors = [], []
+        start_barrier.wait()
+        for i in range(ops):
+            task_id = rnd.choice(task_ids)
+            start = time.perf_counter()
+            try:
+                if i % 4:
+                    move(task_id, rnd.choice(STATUSES))
+                else:
+                    edit(tasks[task_id].replace(description=f"sesja {n}, zmiana {i}"))
+            except Exception as exc:  # np. "database is locked"
+                own_errors.append(str(exc))
+            own_latencies.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(own_latencies)
+            errors.extend(own_errors)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "ops_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)],
+        "max_ms": latencies[-1],
+        "errors": len(errors),
+        "sample_error": errors[0] if errors else "",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=200, help="zapisów na sesję")
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    source = synthetic.board_path(args.size)
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("direct", "writer"):
+            # Każdy tryb na świeżej kopii bazy
+            path = Path(tmp) / f"{mode}.db"
+            shutil.copy(source, path)
+            db.DB_PATH = path
+            db.close_connections()
+            db.init_db()
+            task_ids = [t.id for t in db.get_all_tasks(DEFAULT_BOARD_ID)]
+
+            result = _run(mode, args.sessions, args.ops, task_ids, args.seed)
+            stats = db.writer_stats()
+            db.close_connections()
+
+            print(
+                f"{mode:<7} {result['ops_per_s']:8.0f} op/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:8.2f} ms  "
+                f"max {result['max_ms']:8.2f} ms  błędy {result['errors']}"
+            )
+            if mode == "writer":
+                print(f"        {stats['operations']} operacji w {stats['commits']} commitach")
+            if result["sample_error"]:
+                print(f"        np. {result['sample_error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Generator syntetycznych baz kanban.db do benchmarków.
+
+Rozkłady są zbliżone do prawdziwych tablic: większość zadań to "To Do"
+i "Done", priorytet średni dominuje, ~60% zadań ma termin (część już
+minęła), opisy mają długość o rozkładzie log-normalnym. Przy `boards` > 1
+każda tablica dostaje `size` zadań - pozwala to sprawdzić, czy zapytania
+jednej tablicy nie zwalniają, gdy rośnie łączna liczba zadań.
+"""
+import random
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database as db  # noqa: E402
+from models import Task, DEFAULT_BOARD_ID  # noqa: E402
+
+DATA_DIR = Path(__file__).resolve().parent / ".data"
+
+STATUS_WEIGHTS = {"To Do": 0.4, "In Progress": 0.2, "Done": 0.4}
+PRIORITY_WEIGHTS = {"Niski": 0.3, "Średni": 0.5, "Wysoki": 0.2}
+DEADLINE_RATIO = 0.6
+
+_WORDS = (
+    "raport klient wdrożenie poprawka błąd testy dokumentacja spotkanie "
+    "migracja serwer logowanie płatności faktura analiza projekt makieta "
+    "integracja aplikacja baza danych wydajność przegląd kodu sprint zespół"
+).split()
+
+_CHUNK = 10_000
+
+
+def _random_task(rnd: random.Random, today: date, board_id: int) -> Task:
+    status = rnd.choices(list(STATUS_WEIGHTS), weights=STATUS_WEIGHTS.values())[0]
+    priority = rnd.choices(list(PRIORITY_WEIGHTS), weights=PRIORITY_WEIGHTS.values())[0]
+    deadline = None
+    if rnd.random() < DEADLINE_RATIO:
+        deadline = today + timedelta(days=int(rnd.gauss(7, 21)))
+    n_words = min(int(rnd.lognormvariate(2.0, 1.0)), 200)
+    created = datetime.combine(today, datetime.min.time()) - timedelta(
+        minutes=rnd.randint(0, 60 * 24 * 365)
+    )
+    return Task(
+        title=" ".join(rnd.choices(_WORDS, k=rnd.randint(2, 6))).capitalize(),
+        status=status,
+        priority=priority,
+        description=" ".join(rnd.choices(_WORDS, k=n_words)),
+        deadline=deadline,
+        created_at=created.isoformat(),
+        board_id=board_id,
+    )
+
+
+def generate(path: Path, size: int, seed: int = 0, boards: int = 1) -> Path:
+    """Tworzy bazę z `boards` tablicami po `size` zadań pod `path` (nadpisuje plik)."""
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+    previous = db.DB_PATH
+    db.DB_PATH = path
+    try:
+        db.init_db()
+        rnd = random.Random(seed)
+        today = date.today()
+        board_ids = [DEFAULT_BOARD_ID] + [db.add_board(f"Tablica {n}") for n in range(2, boards + 1)]
+        for board_id in board_ids:
+            for start in range(0, size, _CHUNK):
+                db.add_tasks([
+                    _random_task(rnd, today, board_id) for _ in range(min(_CHUNK, size - start))
+                ])
+        with db.connection() as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("ANALYZE")
+    finally:
+        db.close_connections()
+        db.DB_PATH = previous
+    return path
+
+
+def board_path(size: int, seed: int = 0, boards: int = 1) -> Path:
+    """Ścieżka bazy danego rozmiaru; generuje ją, jeśli jeszcze nie istnieje."""
+    DATA_DIR.mkdir(exist_ok=True)
+    suffix = f"_x{boards}" if boards > 1 else ""
+    path = DATA_DIR / f"board_{size}_{seed}{suffix}.db"
+    if not path.exists():
+        generate(path, size, seed, boards)
+    return path
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:] or ["1000"]:
+        print(board_path(int(arg)))
@@ -0,0 +1,181 @@
+"""Optymistyczne zmiany na tablicy z zapisem w tle (write-behind).
+
+Przeniesienie, edycja i usunięcie karty są od razu widoczne: trafiają do
+nakładki `_pending`, którą tablica nakłada na wyniki zapytań. Zapis do
+SQLite wykonuje wątek zapisu bazy (db.*.submit), który zachowuje kolejność
+zmian. Po udanym commicie wpis z nakładki znika
+(dane z bazy są już aktualne); po błędzie też znika - to jest rollback -
+a komunikat trafia do sesji, która zlecała zmianę.
+"""
+import threading
+from concurrent.futures import Future
+from datetime import date
+from typing import Callable, Optional
+
+import database as db
+from models import Task
+
+
+class _Pending:
+    __slots__ = ("original", "current")
+
+    def __init__(self, original: Task, current: Optional[Task]) -> None:
+        self.original = original  # stan z bazy przed zmianą
+        self.current = current  # stan optymistyczny (None = usunięte)
+
+
+_lock = threading.Lock()
+_pending: dict[int, _Pending] = {}
+_errors: dict[str, list[str]] = {}
+
+
+def _submit(
+    owner: str,
+    original: Task,
+    current: Optional[Task],
+    write: Callable[[], Future],
+    description: str,
+) -> Future:
+    with _lock:
+        previous = _pending.get(original.id)
+        # Kolejna zmiana tej samej karty zachowuje pierwotny stan z bazy
+        entry = _Pending(previous.original if previous else original, current)
+        _pending[original.id] = entry
+
+    def done(future: Future) -> None:
+        with _lock:
+            if _pending.get(original.id) is entry:
+                del _pending[original.id]
+            if future.exception() is not None:
+                _errors.setdefault(owner, []).append(
+                    f"{description} nie powiodło się: {future.exception()}"
+                )
+
+    try:
+        future = write()
+    except BaseException:
+        # Zapis nie został nawet zlecony (np. zamknięty wątek zapisu) - bez wpisu w nakładce
+        with _lock:
+            if _pending.get(original.id) is entry:
+                del _pending[original.id]
+        raise
+    future.add_done_callback(done)
+    return future
+
+
+def move_task(owner: str, task: Task, new_status: str) -> Future:
+    """Przenosi kartę do innej kolumny (od razu widoczne, zapis w tle)."""
+    return _submit(
+        owner,
+        task,
+        task.replace(status=new_status),
+        lambda: db.update_task_status.submit(task.id, new_status),
+        f"Przeniesienie „{task.title}”",
+    )
+
+
+def update_task(owner: str, task: Task, updated: Task) -> Future:
+    """Zapisuje zmienione pola karty (np. opis). `task` to karta sprzed edycji."""
+    return _submit(
+        owner,
+        task,
+        updated,
+        lambda: db.update_task.submit(updated),
+        f"Zapis „{updated.title}”",
+    )
+
+
+def delete_task(owner: str, task: Task) -> Future:
+    """Usuwa kartę (od razu znika z tablicy, zapis w tle)."""
+    return _submit(
+        owner,
+        task,
+        None,
+        lambda: db.delete_task.submit(task.id),
+        f"Usunięcie „{task.title}”",
+    )
+
+
+def apply_to_column(tasks: list[Task], status: str) -> list[Task]:
+    """Nakłada oczekujące zmiany na zadania jednej kolumny.
+
+    Podmienia edytowane karty, pomija przeniesione gdzie indziej i usunięte.
+    """
+    with _lock:
+        if not _pending:
+            return tasks
+        pending = dict(_pending)
+
+    result = []
+    for task in tasks:
+        entry = pending.get(task.id)
+        if entry is None:
+            result.append(task)
+        elif entry.current is not None and entry.current.status == status:
+            result.append(entry.current)
+    return result
+
+
+def moved_into(board_id: int, status: str, present_ids: set[int]) -> list[Task]:
+    """Zadania optymistycznie przeniesione do kolumny `status`, których jeszcze w niej nie ma."""
+    with _lock:
+        return [
+            e.current
+            for task_id, e in _pending.items()
+            if e.current is not None
+            and e.current.board_id == board_id
+            and e.current.status == status
+            and task_id not in present_ids
+        ]
+
+
+def _board_entries(board_id: int) -> list[_Pending]:
+    with _lock:
+        return [e for e in _pending.values() if e.original.board_id == board_id]
+
+
+def adjust_counts(
+    counts: dict[str, int], board_id: int, matches: Callable[[Task], bool] = lambda task: True
+) -> dict[str, int]:
+    """Koryguje liczniki statusów tablicy o oczekujące przeniesienia i usunięcia.
+
+    `matches` mówi, czy zadanie jest liczone (np. spełnia filtry tablicy).
+    """
+    entries = _board_entries(board_id)
+    if not entries:
+        return counts
+
+    counts = dict(counts)
+    for entry in entries:
+        if matches(entry.original) and entry.original.status in counts:
+            counts[entry.original.status] -= 1
+        if entry.current is not None and matches(entry.current) and entry.current.status in counts:
+            counts[entry.current.status] += 1
+    return counts
+
+
+def adjust_stats(stats: dict, board_id: int, today: Optional[date] = None) -> dict:
+    """Koryguje statystyki tablicy z db.get_stats() o oczekujące zmiany."""
+    by_status = adjust_counts(stats["by_status"], board_id)
+    if by_status is stats["by_status"]:
+        return stats
+
+    entries = _board_entries(board_id)
+    overdue = stats["overdue"]
+    for entry in entries:
+        overdue -= entry.original.is_overdue(today)
+        overdue += entry.current is not None and entry.current.is_overdue(today)
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "done": by_status.get("Done", 0),
+        "in_progress": by_status.get("In Progress", 0),
+        "overdue": max(overdue, 0),
+    }
+
+
+def pop_errors(owner: str) -> list[str]:
+    """Zwraca i czyści błędy zapisów zleconych przez sesję `owner`."""
+    with _lock:
+        return _errors.pop(owner, [])
@@ -0,0 +1,71 @@
+import streamlit as st
+
+import database as db
+
+
+# Ile zarchiwizowanych zadań widok pokazuje na start i dokłada po "Pokaż więcej"
+ARCHIVE_PAGE_SIZE = 20
+
+
+def render_archive(board_id: int) -> None:
+    """Renderuje w sidebarze archiwum tablicy: archiwizację na żądanie i przywracanie."""
+    with st.expander("🗄️ Archiwum"):
+        count = db.count_archived(board_id)
+        st.caption(
+            f"Zadań w archiwum: {count}. Ukończone ponad {db.ARCHIVE_AFTER_DAYS} dni temu "
+            "trafiają tu automatycznie."
+        )
+
+        result = st.session_state.pop("archive_result", None)
+        if result:
+            st.success(result)
+
+        days = st.number_input(
+            "Ukończone ponad (dni)", min_value=0, value=db.ARCHIVE_AFTER_DAYS, key="archive_days"
+        )
+        st.button(
+            "Archiwizuj teraz",
+            use_container_width=True,
+            on_click=_archive_now,
+            args=(board_id, int(days)),
+        )
+
+        # Lista archiwum ładowana dopiero na żądanie
+        if not count or not st.toggle("Pokaż archiwum", key="show_archive"):
+            return
+
+        limit = st.session_state.get("archive_limit", ARCHIVE_PAGE_SIZE)
+        for task in db.get_archived_tasks(board_id, limit=limit):
+            col_title, col_restore = st.columns([5, 1])
+            col_title.markdown(f"{task.priority_icon} {task.title}")
+            col_restore.button(
+                "↩️",
+                key=f"restore_{task.id}",
+                help="Przywróć na tablicę",
+                on_click=_restore,
+                args=(board_id, task.id),
+            )
+
+        if count > limit:
+            st.button(
+                f"Pokaż więcej ({count - limit})",
+                key="archive_more",
+                on_click=_show_more,
+                use_container_width=True,
+            )
+
+
+def _archive_now(board_id: int, days: int) -> None:
+    moved = db.archive_done_tasks(board_id, days)
+    st.session_state["archive_result"] = f"Zarchiwizowano {moved} zadań."
+
+
+def _restore(board_id: int, task_id: int) -> None:
+    if db.restore_tasks(board_id, [task_id]).get(task_id):
+        st.session_state["archive_result"] = "Przywrócono zadanie do kolumny Done."
+
+
+def _show_more() -> None:
+    st.session_state["archive_limit"] = (
+        st.session_state.get("archive_limit", ARCHIVE_PAGE_SIZE) + ARCHIVE_PAGE_SIZE
+    )
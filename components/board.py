@@ -1,9 +1,15 @@
+import uuid
+from bisect import bisect_left
+from datetime import date
+from typing import Collection, Optional
+
 import streamlit as st
-from streamlit_sortables import sort_items
 
-from models import Task, STATUSES, PRIORITY_COLORS
+from models import Task, STATUSES, PRIORITY_COLORS, deadline_bounds
 from components.task_card import render_task_card
+import board_state
 import database as db
+import profiling
 
 
 # Custom CSS dla sortable komponentu
@@ -72,8 +78,20 @@ STATUS_CONFIG = {
     "Done": {"color": "#4ade80", "icon": "✅", "bg": "linear-gradient(to right, #14532d, #2d2d3d)"},
 }
 
-def _apply_filters(tasks: list[Task], filters: dict) -> list[Task]:
-    """Stosuje filtry do listy zadań."""
+# Ile kart kolumna pokazuje na start i dokłada po kliknięciu "Pokaż więcej"
+COLUMN_PAGE_SIZE = 20
+# Co ile sekund sesja z włączonym auto-odświeżaniem sprawdza dziennik zmian
+AUTO_REFRESH_SECONDS = 5
+
+
+def _apply_filters(
+    tasks: list[Task], filters: dict, matching_ids: Optional[Collection[int]] = None
+) -> list[Task]:
+    """Stosuje filtry do listy zadań.
+
+    `matching_ids` to gotowy wynik wyszukiwania (jeden na rerun); bez niego
+    wyszukiwanie jest wykonywane tutaj.
+    """
     filtered = tasks
 
     if filters.get("priority"):
@@ -82,69 +100,193 @@ def _apply_filters(tasks: list[Task], filters: dict) -> list[Task]:
     if filters.get("hide_done"):
         filtered = [t for t in filtered if t.status != "Done"]
 
-    return filtered
-
-
-def _build_sortable_items(tasks: list[Task], filters: dict) -> list[dict]:
-    """Buduje strukturę danych dla sort_items (multi-container)."""
-    filtered = _apply_filters(tasks, filters)
-
-    containers = []
-    for status in STATUSES:
-        status_tasks = [t for t in filtered if t.status == status]
-        items = [render_task_card(t) for t in status_tasks]
-        containers.append({"header": status, "items": items})
-
-    return containers
+    if filters.get("deadline"):
+        start, end = deadline_bounds(filters["deadline"], filters["today"])
+        filtered = [t for t in filtered if t.is_due_within(start, end)]
 
+    if filters.get("search"):
+        if matching_ids is None:
+            matching_ids = set(
+                db.search_task_ids(filters["board_id"], filters["search"], ranked=False)
+            )
+        filtered = [t for t in filtered if t.id in matching_ids]
 
-def _find_task_by_card_text(tasks: list[Task], card_text: str) -> Task | None:
-    """Znajduje zadanie na podstawie tekstu karty."""
-    for t in tasks:
-        if render_task_card(t) == card_text:
-            return t
-    return None
-
+    return filtered
 
-def render_board(tasks: list[Task], filters: dict) -> None:
-    """Renderuje tablicę kanban z rozwijanymi kartami zadań."""
-    filtered = _apply_filters(tasks, filters)
 
-    # Nagłówki kolumn
+def _build_sortable_items(columns: dict[str, list[Task]], today: date) -> list[dict]:
+    """Buduje strukturę danych dla sort_items (multi-container)."""
+    return [
+        {"header": status, "items": [render_task_card(t, today) for t in columns.get(status, [])]}
+        for status in STATUSES
+    ]
+
+
+def _card_id(card_text: str) -> int | None:
+    """Odczytuje id zadania z sufiksu `#id` tekstu karty."""
+    _, sep, suffix = card_text.rpartition("#")
+    return int(suffix) if sep and suffix.isdigit() else None
+
+
+def _stable_ids(tasks: list[Task], status: str) -> set[int]:
+    """Karty, które mogą zostać na miejscu: najdłuższy rosnący (po randze)
+    podciąg kart, które już były w tej kolumnie."""
+    tails: list[tuple[float, int]] = []
+    tail_idx: list[int] = []
+    parent: list[int] = [-1] * len(tasks)
+    for i, task in enumerate(tasks):
+        if task.status != status:
+            continue
+        key = (task.rank, task.id)
+        pos = bisect_left(tails, key)
+        if pos == len(tails):
+            tails.append(key)
+            tail_idx.append(i)
+        else:
+            tails[pos] = key
+            tail_idx[pos] = i
+        parent[i] = tail_idx[pos - 1] if pos > 0 else -1
+
+    stable = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i != -1:
+        stable.add(tasks[i].id)
+        i = parent[i]
+    return stable
+
+
+def _diff_layout(
+    sorted_containers: list[dict], index: dict[int, Task], has_more: dict[str, bool]
+) -> dict[int, tuple[str, float]]:
+    """Porównuje układ po upuszczeniu z aktualnym stanem.
+
+    Zwraca {id: (status, ranga)} tylko dla kart, które trzeba przestawić -
+    przy pojedynczym przeciągnięciu to jedna karta. `has_more` mówi, które
+    kolumny mają za oknem niewczytane karty.
+    """
+    positions = {}
+    for status, container in zip(STATUSES, sorted_containers):
+        tasks = [index[i] for i in map(_card_id, container["items"]) if i in index]
+        stable = _stable_ids(tasks, status)
+        prev = None
+        for pos, task in enumerate(tasks):
+            if task.id in stable:
+                prev = task.rank
+                continue
+            nxt = next((t.rank for t in tasks[pos + 1:] if t.id in stable), None)
+            if nxt is None and has_more.get(status):
+                # Za oknem są dalsze karty - ranga nie może ich przeskoczyć
+                nxt = db.next_rank(task.board_id, status, prev, task.id)
+            rank = db.rank_between(prev, nxt)
+            if nxt is not None and nxt - rank < db.RANK_MIN_GAP:
+                db.schedule_rebalance(task.board_id, status)
+            positions[task.id] = (status, rank)
+            prev = rank
+    return positions
+
+
+def render_board(filters: dict) -> None:
+    """Renderuje tablicę kanban (wybraną w sidebarze) z rozwijanymi kartami zadań."""
+    board_id = filters["board_id"]
+    for message in board_state.pop_errors(_session_owner()):
+        st.error(message)
+
+    # Stare ukończone zadania trafiają do archiwum w tle (najwyżej raz na db.ARCHIVE_INTERVAL)
+    db.schedule_archive(board_id)
+
+    # Ostatnia zmiana widziana przez tę sesję - fragment poniżej odświeża
+    # widok tylko wtedy, gdy w dzienniku pojawi się coś nowszego
+    if filters.get("auto_refresh"):
+        _watch_changes(board_id, db.latest_change(board_id))
+
+    with profiling.span("fetch"):
+        # Liczniki kolumn liczone wektorowo na widoku kolumnowym
+        table = db.load_task_table(board_id)
+        search = filters.get("search")
+        # Jedno wyszukiwanie na rerun: liczniki, oczekujące zmiany i strony kolumn
+        # (get_tasks_page) korzystają z tego samego wyniku
+        matching_ids = (
+            frozenset(db.search_task_ids(board_id, search, ranked=False)) if search else None
+        )
+        counts = table.status_counts(table.filter_mask(filters, matching_ids))
+
+        # Zmiany zlecone, ale jeszcze niezapisane, są widoczne od razu
+        def matches(task: Task) -> bool:
+            return bool(_apply_filters([task], filters, matching_ids))
+
+        counts = board_state.adjust_counts(counts, board_id, matches)
+
+        # Filtrowanie w SQL - pobieramy tylko widoczne okno każdej kolumny
+        columns: dict[str, list[Task]] = {}
+        has_more: dict[str, bool] = {}
+        for status in STATUSES:
+            status_tasks, has_more[status] = _load_column_window(board_id, filters, status)
+            status_tasks = board_state.apply_to_column(status_tasks, status)
+            present = {t.id for t in status_tasks}
+            status_tasks += [t for t in board_state.moved_into(board_id, status, present) if matches(t)]
+            columns[status] = status_tasks
+
+    with profiling.span("render"):
+        if filters.get("drag_mode"):
+            _render_sortable_board(board_id, columns, counts, has_more, filters["today"])
+        else:
+            _render_columns(columns, counts, has_more, filters["today"])
+
+    st.divider()
+    _render_bulk_actions(board_id, [t for status in STATUSES for t in columns[status]])
+
+
+@st.fragment(run_every=AUTO_REFRESH_SECONDS)
+def _watch_changes(board_id: int, seen: int) -> None:
+    """Co AUTO_REFRESH_SECONDS sprawdza dziennik zmian; rerun tylko po nowych zmianach."""
+    if db.latest_change(board_id) > seen:
+        st.rerun()
+
+
+def _render_column_header(status: str, count: int) -> None:
+    cfg = STATUS_CONFIG[status]
+    st.markdown(
+        f'''<div style="
+            background: {cfg["bg"]};
+            border-left: 4px solid {cfg["color"]};
+            color: {cfg["color"]};
+            padding: 12px 16px;
+            border-radius: 8px;
+            font-weight: 700;
+            font-size: 0.95rem;
+            margin-bottom: 12px;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+        ">
+            <span>{cfg["icon"]} {status}</span>
+            <span style="
+                background: {cfg["color"]};
+                color: white;
+                border-radius: 12px;
+                padding: 2px 10px;
+                font-size: 0.8rem;
+            ">{count}</span>
+        </div>''',
+        unsafe_allow_html=True,
+    )
+
+
+def _render_columns(
+    columns: dict[str, list[Task]],
+    counts: dict[str, int],
+    has_more: dict[str, bool],
+    today: date,
+) -> None:
+    """Renderuje kolumny z rozwijanymi kartami i przyciskami przenoszenia."""
     cols = st.columns(len(STATUSES))
     for col, status in zip(cols, STATUSES):
-        cfg = STATUS_CONFIG[status]
-        status_tasks = [t for t in filtered if t.status == status]
-        count = len(status_tasks)
-        
+        status_tasks = columns[status]
+        count = counts[status]
+
         with col:
-            # Nagłówek kolumny
-            st.markdown(
-                f'''<div style="
-                    background: {cfg["bg"]};
-                    border-left: 4px solid {cfg["color"]};
-                    color: {cfg["color"]};
-                    padding: 12px 16px;
-                    border-radius: 8px;
-                    font-weight: 700;
-                    font-size: 0.95rem;
-                    margin-bottom: 12px;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                ">
-                    <span>{cfg["icon"]} {status}</span>
-                    <span style="
-                        background: {cfg["color"]};
-                        color: white;
-                        border-radius: 12px;
-                        padding: 2px 10px;
-                        font-size: 0.8rem;
-                    ">{count}</span>
-                </div>''',
-                unsafe_allow_html=True,
-            )
-            
+            _render_column_header(status, count)
+
             # Zadania w tej kolumnie
             if not status_tasks:
                 st.markdown(
@@ -165,11 +307,135 @@ def render_board(tasks: list[Task], filters: dict) -> None:
                 )
             else:
                 for task in status_tasks:
-                    _render_task_card(task, status)
+                    _render_task_card(task, status, today)
+
+            if has_more[status]:
+                st.button(
+                    f"Pokaż więcej ({count - len(status_tasks)})",
+                    key=f"more_{status}",
+                    on_click=_show_more,
+                    args=(status,),
+                    use_container_width=True,
+                )
+
+
+def _render_sortable_board(
+    board_id: int,
+    columns: dict[str, list[Task]],
+    counts: dict[str, int],
+    has_more: dict[str, bool],
+    today: date,
+) -> None:
+    """Renderuje tablicę drag & drop; zmiany z jednego upuszczenia zapisuje w jednej transakcji."""
+    cols = st.columns(len(STATUSES))
+    for col, status in zip(cols, STATUSES):
+        with col:
+            _render_column_header(status, counts[status])
+
+    # Komponent drag & drop ładowany dopiero w trybie przeciągania
+    from streamlit_sortables import sort_items
+
+    # Indeks id -> zadanie zamiast porównywania tekstów kart (O(1) na kartę)
+    index = {t.id: t for status_tasks in columns.values() for t in status_tasks}
+    sorted_containers = sort_items(
+        _build_sortable_items(columns, today),
+        multi_containers=True,
+        direction="vertical",
+        custom_style=SORTABLE_CSS,
+    )
+
+    if sorted_containers:
+        positions = _diff_layout(sorted_containers, index, has_more)
+        if positions:
+            db.set_positions(board_id, positions)
+            st.rerun()
 
 
-def _render_task_card(task: Task, current_status: str) -> None:
-    """Renderuje kartę zadania z możliwością rozwinięcia."""
+def _load_column_window(board_id: int, filters: dict, status: str) -> tuple[list[Task], bool]:
+    """Pobiera kolejne strony kolumny (keyset) aż do rozmiaru okna.
+
+    Zwraca (zadania, czy są kolejne). Każda strona jest osobno cache'owana,
+    więc powiększenie okna dociąga tylko nową stronę.
+    """
+    pages = st.session_state.get(f"pages_{status}", 1)
+    tasks: list[Task] = []
+    cursor = None
+    for _ in range(pages):
+        page, cursor = db.get_tasks_page(
+            board_id, filters, status, limit=COLUMN_PAGE_SIZE, after=cursor
+        )
+        tasks.extend(page)
+        if cursor is None:
+            break
+    return tasks, cursor is not None
+
+
+def _session_owner() -> str:
+    """Identyfikator sesji, do której wracają błędy zapisów w tle."""
+    return st.session_state.setdefault("board_owner", uuid.uuid4().hex)
+
+
+def _show_more(status: str) -> None:
+    key = f"pages_{status}"
+    st.session_state[key] = st.session_state.get(key, 1) + 1
+
+
+def _render_bulk_actions(board_id: int, tasks: list[Task]) -> None:
+    """Renderuje operacje grupowe na widocznych zadaniach (przeniesienie / usunięcie)."""
+    with st.expander("☑️ Operacje grupowe"):
+        result = st.session_state.pop("bulk_result", None)
+        if result:
+            st.success(result)
+
+        labels = {t.id: f"{t.priority_icon} {t.title} ({t.status}) #{t.id}" for t in tasks}
+        selected = st.multiselect(
+            "Zadania",
+            list(labels),
+            format_func=labels.get,
+            placeholder="Wybierz zadania...",
+            key="bulk_selected",
+        )
+
+        col_status, col_move, col_del = st.columns([2, 1, 1])
+        with col_status:
+            target = st.selectbox(
+                "Docelowy status", STATUSES, label_visibility="collapsed", key="bulk_target"
+            )
+        with col_move:
+            if st.button("Przenieś zaznaczone", disabled=not selected, use_container_width=True):
+                results = db.update_statuses(board_id, selected, target)
+                st.session_state["bulk_result"] = (
+                    f"Przeniesiono {sum(results.values())} z {len(results)} zadań do „{target}”."
+                )
+                st.session_state.pop("bulk_selected", None)
+                st.rerun()
+        with col_del:
+            if st.button(
+                "Usuń zaznaczone",
+                disabled=not selected,
+                use_container_width=True,
+                type="primary",
+            ):
+                results = db.delete_tasks(board_id, selected)
+                st.session_state["bulk_result"] = (
+                    f"Usunięto {sum(results.values())} z {len(results)} zadań."
+                )
+                st.session_state.pop("bulk_selected", None)
+                st.rerun()
+
+
+def _toggle_details(toggle_key: str) -> None:
+    st.session_state[toggle_key] = not st.session_state[toggle_key]
+
+
+@st.fragment
+def _render_task_card(task: Task, current_status: str, today: date) -> None:
+    """Renderuje kartę zadania z możliwością rozwinięcia.
+
+    Karta jest fragmentem: rozwinięcie i zapis opisu przerysowują tylko ją.
+    Przeniesienie i usunięcie zmieniają kolumny i statystyki, więc
+    wywołują pełny rerun aplikacji.
+    """
     priority_color = PRIORITY_COLORS.get(task.priority, "#9E9E9E")
     
     # Sprawdź czy można przesunąć w lewo/prawo
@@ -193,7 +459,7 @@ def _render_task_card(task: Task, current_status: str) -> None:
             if can_move_left:
                 new_status = STATUSES[current_idx - 1]
                 if st.button("⬅️", key=f"left_{task.id}", use_container_width=True):
-                    db.update_task_status(task.id, new_status)
+                    board_state.move_task(_session_owner(), task, new_status)
                     st.rerun()
         
         # Tytuł
@@ -229,7 +495,7 @@ def _render_task_card(task: Task, current_status: str) -> None:
             if can_move_right:
                 new_status = STATUSES[current_idx + 1]
                 if st.button("➡️", key=f"right_{task.id}", use_container_width=True):
-                    db.update_task_status(task.id, new_status)
+                    board_state.move_task(_session_owner(), task, new_status)
                     st.rerun()
         
 
@@ -237,7 +503,7 @@ def _render_task_card(task: Task, current_status: str) -> None:
         # Deadline
         if task.deadline:
             dl = task.deadline.strftime("%d.%m.%Y")
-            overdue_color = "#ef4444" if task.is_overdue else "#888"
+            overdue_color = "#ef4444" if task.is_overdue(today) else "#888"
             st.markdown(
                 f'<div style="font-size:0.8rem;color:{overdue_color};margin-top:6px;">'
                 f'📅 {dl}</div>',
@@ -248,13 +514,13 @@ def _render_task_card(task: Task, current_status: str) -> None:
         expand_icon = "🔽" if not st.session_state[toggle_key] else "🔼"
         expand_text = "Pokaż szczegóły" if not st.session_state[toggle_key] else "Ukryj szczegóły"
         
-        if st.button(
+        st.button(
             f"{expand_icon} {expand_text}",
             key=f"toggle_{task.id}",
+            on_click=_toggle_details,
+            args=(toggle_key,),
             use_container_width=True,
-        ):
-            st.session_state[toggle_key] = not st.session_state[toggle_key]
-            st.rerun()
+        )
         
         # Rozwinięta część
         if st.session_state[toggle_key]:
@@ -272,57 +538,25 @@ def _render_task_card(task: Task, current_status: str) -> None:
             col_save, col_del = st.columns(2)
             with col_save:
                 if st.button("💾 Zapisz", key=f"save_{task.id}", use_container_width=True):
-                    if new_desc != task.description:
-                        task.description = new_desc
-                        db.update_task(task)
-                        st.rerun()
+                    # Rerun fragmentu dostaje `task` z ostatniego pełnego przebiegu -
+                    # porównujemy z opisem zapisanym ostatnio w tej sesji, dopóki
+                    # pełny rerun nie przyniesie z bazy nowszego
+                    saved_key = f"saved_desc_{task.id}"
+                    saved = st.session_state.get(saved_key)
+                    current = saved[1] if saved and saved[0] == task.description else task.description
+                    if new_desc != current:
+                        # Zadania z cache są współdzielone - zapisujemy kopię
+                        board_state.update_task(
+                            _session_owner(),
+                            task.replace(description=current),
+                            task.replace(description=new_desc),
+                        )
+                        st.session_state[saved_key] = (task.description, new_desc)
             with col_del:
                 if st.button("🗑️ Usuń", key=f"del_{task.id}", use_container_width=True, type="primary"):
-                    db.delete_task(task.id)
+                    board_state.delete_task(_session_owner(), task)
                     st.rerun()
-        # count = len([c for c in containers if c["header"] == status][0]["items"])
-#         col.markdown(
-#             f'''<div style="
-#                 background: {cfg["bg"]};
-#                 border-left: 4px solid {cfg["color"]};
-#                 color: {cfg["color"]};
-#                 padding: 12px 16px;
-#                 border-radius: 8px;
-#                 font-weight: 700;
-#                 font-size: 0.95rem;
-#                 margin-bottom: 4px;
-#                 display: flex;
-#                 justify-content: space-between;
-#                 align-items: center;
-#             ">
-#                 <span>{cfg["icon"]} {status}</span>
-#                 <span style="
-#                     background: {cfg["color"]};
-#                     color: white;
-#                     border-radius: 12px;
-#                     padding: 2px 10px;
-#                     font-size: 0.8rem;
-#                 ">{count}</span>
-#             </div>''',
-#             unsafe_allow_html=True,
-#         )
-
-#     # Drag & drop sortable
-#     sorted_containers = sort_items(
-#         containers,
-#         multi_containers=True,
-#         direction="vertical",
-#         custom_style=SORTABLE_CSS,
-#     )
-
-#     # Wykryj zmiany statusu
-#     if sorted_containers:
-#         for i, status in enumerate(STATUSES):
-#             for card_text in sorted_containers[i]["items"]:
-#                 task = _find_task_by_card_text(tasks, card_text)
-#                 if task and task.status != status:
-#                     db.update_task_status(task.id, status)
-#                     st.rerun()
+
 
 #     # Akcje na zadaniach (edycja opisu, usuwanie) przez popovery
 #     st.divider()
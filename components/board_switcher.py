@@ -0,0 +1,47 @@
+import streamlit as st
+
+import database as db
+
+
+def render_board_switcher() -> int:
+    """Renderuje w sidebarze wybór tablicy i formularz nowej tablicy. Zwraca id wybranej tablicy."""
+    boards = db.get_boards()
+    if st.session_state.get("board_id") not in boards:
+        # Pierwsza (najstarsza) tablica to tablica domyślna
+        st.session_state["board_id"] = next(iter(boards))
+
+    board_id = st.selectbox(
+        "Tablica",
+        list(boards),
+        format_func=boards.get,
+        key="board_id",
+        on_change=_reset_board_view,
+    )
+
+    with st.expander("➕ Nowa tablica"):
+        with st.form("add_board_form", clear_on_submit=True):
+            st.text_input("Nazwa", placeholder="Np. Marketing", key="new_board_name")
+            st.form_submit_button("Utwórz", use_container_width=True, on_click=_create_board)
+        error = st.session_state.pop("board_error", None)
+        if error:
+            st.error(error)
+
+    return board_id
+
+
+def _create_board() -> None:
+    # Callback - wykonuje się przed rerunem, więc może przełączyć selectbox na nową tablicę
+    try:
+        st.session_state["board_id"] = db.add_board(st.session_state.get("new_board_name", ""))
+    except ValueError as exc:
+        st.session_state["board_error"] = f"Nie utworzono tablicy: {exc}"
+        return
+    _reset_board_view()
+
+
+def _reset_board_view() -> None:
+    """Czyści stan widoku poprzedniej tablicy (okna kolumn, zaznaczenia, eksport, archiwum)."""
+    for key in [k for k in st.session_state if k.startswith("pages_")]:
+        del st.session_state[key]
+    for key in ("bulk_selected", "bulk_result", "export_file", "archive_limit", "archive_result"):
+        st.session_state.pop(key, None)
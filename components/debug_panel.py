@@ -0,0 +1,64 @@
+import sys
+
+import streamlit as st
+
+import database as db
+import profiling
+
+
+def render_debug_panel(run: dict | None) -> None:
+    """Renderuje zwijany panel profilowania ostatniego reruna (KANBAN_PROFILE=1)."""
+    if run is None:
+        return
+
+    with st.expander(f"🛠️ Profilowanie: {run['total_ms']:.1f} ms"):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Zapytania SQL", run["queries"])
+        col2.metric("SQL (execute)", f"{run['sql_ms']:.1f} ms")
+        col3.metric("Fetch + dekodowanie", f"{run['fetch_ms']:.1f} ms")
+
+        stats = profiling.percentiles()
+        st.markdown("**Fazy reruna**")
+        st.table([
+            {
+                "Faza": name,
+                "Ten rerun [ms]": round(ms, 2),
+                "p50 [ms]": round(stats.get(name, {}).get(50, 0.0), 2),
+                "p95 [ms]": round(stats.get(name, {}).get(95, 0.0), 2),
+            }
+            for name, ms in run["spans"].items()
+        ])
+        total = stats.get("total", {})
+        st.caption(
+            f"Całość z {len(profiling.history())} ostatnich reranów: "
+            f"p50 {total.get(50, 0.0):.1f} ms, p95 {total.get(95, 0.0):.1f} ms"
+        )
+
+        if run["slowest"]:
+            st.markdown("**Najwolniejsze zapytania**")
+            for query in run["slowest"]:
+                st.code(f"{query['ms']:.2f} ms  {' '.join(query['sql'].split())}", language="sql")
+
+        cache = db.cache_info()
+        st.caption(
+            f"Cache odczytów: {cache['hits']} trafień, {cache['misses']} chybień, "
+            f"{cache['invalidations']} unieważnień"
+        )
+        writes = db.writer_stats()
+        st.caption(
+            f"Wątek zapisu: {writes['operations']} operacji w {writes['commits']} commitach, "
+            f"{writes['failed']} nieudanych"
+        )
+        # Moduł wykresu (i plotly) jest ładowany leniwie - nie importujemy go tutaj
+        chart = sys.modules.get("components.stats_chart")
+        if chart is not None:
+            info = chart.chart_cache_info()
+            st.caption(
+                f"Cache wykresu: {info['hits']} trafień, {info['misses']} chybień, "
+                f"{info['size']} figur"
+            )
+        st.checkbox(
+            "Loguj rerany jako JSON",
+            key="profile_log",
+            help="Na stderr lub do pliku z KANBAN_PROFILE_LOG (logger kanban.profile)",
+        )
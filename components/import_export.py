@@ -0,0 +1,68 @@
+import csv
+import io
+import tempfile
+
+import streamlit as st
+
+import database as db
+
+
+FORMATS = {
+    "CSV": {"ext": "csv", "mime": "text/csv", "export": db.export_csv, "import": db.import_csv},
+    "NDJSON": {
+        "ext": "ndjson",
+        "mime": "application/x-ndjson",
+        "export": db.export_ndjson,
+        "import": db.import_ndjson,
+    },
+}
+
+
+def render_import_export(board_id: int) -> None:
+    """Renderuje w sidebarze eksport i import zadań tablicy (CSV / NDJSON)."""
+    with st.expander("💾 Import / eksport"):
+        fmt = st.radio("Format", list(FORMATS), horizontal=True, key="transfer_format")
+        cfg = FORMATS[fmt]
+
+        # Eksport: plik generujemy strumieniowo dopiero na żądanie,
+        # żeby nie przepisywać całej tabeli przy każdym rerunie
+        if st.button("Przygotuj eksport", use_container_width=True):
+            with tempfile.TemporaryFile(mode="w+b") as raw:
+                text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                count = cfg["export"](board_id, text)
+                text.flush()
+                raw.seek(0)
+                st.session_state["export_file"] = (fmt, count, raw.read())
+                text.detach()
+
+        export = st.session_state.get("export_file")
+        if export and export[0] == fmt:
+            _, count, data = export
+            st.download_button(
+                f"⬇️ Pobierz ({count} zadań)",
+                data=data,
+                file_name=f"kanban.{cfg['ext']}",
+                mime=cfg["mime"],
+                use_container_width=True,
+            )
+
+        # Import
+        uploaded = st.file_uploader(
+            "Importuj zadania", type=[cfg["ext"]], key=f"import_{fmt}"
+        )
+        if uploaded is not None and st.button("Importuj", use_container_width=True):
+            text = io.TextIOWrapper(uploaded, encoding="utf-8", newline="")
+            try:
+                imported, errors = cfg["import"](board_id, text)
+            except (UnicodeDecodeError, csv.Error) as exc:
+                st.error(
+                    f"Przerwano import - nie udało się odczytać pliku ({exc}). "
+                    "Plik musi być zapisany w UTF-8; zadania z wcześniejszych "
+                    "partii zostały już zaimportowane."
+                )
+                return
+            finally:
+                text.detach()
+            st.success(f"Zaimportowano {imported} zadań.")
+            if errors:
+                st.warning(f"Pominięto {len(errors)} wierszy:\n\n" + "\n".join(errors[:20]))
@@ -1,13 +1,25 @@
+from datetime import date
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
-from models import Task, PRIORITIES, STATUSES
+from models import PRIORITIES, DEADLINE_FILTERS, DUE_SOON_DAYS
+import board_state
 import database as db
+import profiling
 from components.add_task_form import render_add_task_form
+from components.archive import render_archive
+from components.board_switcher import render_board_switcher
+from components.import_export import render_import_export
+
+
+DEADLINE_LABELS = {
+    "overdue": "⏰ Po terminie",
+    "today": "📅 Na dziś",
+    "soon": f"🗓️ {DUE_SOON_DAYS} dni",
+}
 
 
-def render_sidebar(tasks: list[Task]) -> dict:
+def render_sidebar() -> dict:
     """Renderuje sidebar z formularzem, filtrami i statystykami. Zwraca filtry."""
     with st.sidebar:
         st.markdown(
@@ -16,10 +28,17 @@ def render_sidebar(tasks: list[Task]) -> dict:
         )
         st.divider()
 
+        # Wybór tablicy - filtry, formularz i statystyki dotyczą tylko jej
+        board_id = render_board_switcher()
+        # "Dziś" liczone raz na rerun - filtry terminów, statystyki i karty
+        today = date.today()
+
+        st.divider()
+
         # Formularz dodawania
         new_task = render_add_task_form()
         if new_task:
-            db.add_task(new_task)
+            db.add_task(new_task.replace(board_id=board_id))
             st.rerun()
 
         st.divider()
@@ -27,6 +46,11 @@ def render_sidebar(tasks: list[Task]) -> dict:
         # Filtry
         st.subheader("🔍 Filtry")
 
+        search = st.text_input(
+            "Szukaj",
+            placeholder="Tytuł lub opis...",
+        )
+
         selected_priorities = st.multiselect(
             "Priorytet",
             PRIORITIES,
@@ -34,33 +58,65 @@ def render_sidebar(tasks: list[Task]) -> dict:
             placeholder="Wszystkie",
         )
 
+        # Szybkie filtry terminów - liczniki z jednego zapytania po indeksie terminów
+        due = db.count_due(board_id, today)
+        deadline = st.radio(
+            "Termin",
+            (None, *DEADLINE_FILTERS),
+            format_func=lambda kind: (
+                "Wszystkie" if kind is None else f"{DEADLINE_LABELS[kind]} ({due[kind]})"
+            ),
+            horizontal=True,
+            key="deadline_filter",
+        )
+
         hide_done = st.checkbox("Ukryj ukończone")
+        drag_mode = st.toggle("Przeciąganie kart", help="Przenoś karty metodą drag & drop")
+        auto_refresh = st.toggle(
+            "Auto-odświeżanie", help="Pokazuj zmiany innych użytkowników bez przeładowania"
+        )
 
         filters = {
+            "board_id": board_id,
+            "search": search.strip(),
             "priority": selected_priorities,
             "hide_done": hide_done,
+            "deadline": deadline,
+            "today": today,
+            "drag_mode": drag_mode,
+            "auto_refresh": auto_refresh,
         }
 
         st.divider()
 
+        # Import / eksport (przed statystykami, żeby od razu uwzględniły import)
+        render_import_export(board_id)
+        render_archive(board_id)
+
+        st.divider()
+
         # Statystyki
-        _render_stats(tasks)
+        with profiling.span("stats"):
+            _render_stats(
+                board_state.adjust_stats(db.get_stats(board_id, today), board_id, today)
+            )
+            _render_flow(board_id, today)
 
     return filters
 
 
-def _render_stats(tasks: list[Task]) -> None:
-    """Renderuje statystyki w sidebarze."""
+def _render_stats(stats: dict) -> None:
+    """Renderuje statystyki w sidebarze (na podstawie db.get_stats)."""
     st.subheader("📊 Statystyki")
 
-    if not tasks:
+    total = stats["total"]
+    if not total:
         st.caption("Brak zadań.")
         return
 
-    total = len(tasks)
-    done = len([t for t in tasks if t.status == "Done"])
-    in_progress = len([t for t in tasks if t.status == "In Progress"])
-    overdue = len([t for t in tasks if t.is_overdue])
+    done = stats["done"]
+    in_progress = stats["in_progress"]
+    overdue = stats["overdue"]
 
     col1, col2 = st.columns(2)
     col1.metric("Wszystkie", total)
@@ -74,33 +130,19 @@ def _render_stats(tasks: list[Task]) -> None:
         progress = done / total
         st.progress(progress, text=f"Postęp: {progress:.0%}")
 
-    # Wykres statusów
-    status_counts = {s: len([t for t in tasks if t.status == s]) for s in STATUSES}
-    df_status = pd.DataFrame(
-        {"Status": status_counts.keys(), "Liczba": status_counts.values()}
-    )
-
-    if df_status["Liczba"].sum() > 0:
-        colors = {"To Do": "#6366f1", "In Progress": "#f59e0b", "Done": "#10b981"}
-        fig = px.pie(
-            df_status,
-            values="Liczba",
-            names="Status",
-            color="Status",
-            color_discrete_map=colors,
-            hole=0.45,
-        )
-        fig.update_layout(
-            margin=dict(t=0, b=0, l=0, r=0),
-            height=180,
-            showlegend=False,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="white", size=11),
-        )
-        fig.update_traces(
-            textinfo="label+value",
-            textfont_size=11,
-            marker=dict(line=dict(color="#1a1a2e", width=2)),
-        )
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    # Wykres statusów - plotly ładowany dopiero, gdy wykres jest włączony
+    status_counts = stats["by_status"]
+
+    if sum(status_counts.values()) > 0 and st.toggle("📈 Wykres statusów", key="show_chart"):
+        from components.stats_chart import render_status_chart
+
+        render_status_chart(status_counts)
+
+
+def _render_flow(board_id: int, today: date) -> None:
+    """Metryki przepływu (CFD, czas cyklu) - tylko z dziennych agregatów, na żądanie."""
+    if not st.toggle("📉 Przepływ pracy", key="show_flow"):
+        return
+    from components.stats_chart import render_flow_charts
+
+    render_flow_charts(db.get_flow(board_id, today), db.get_cycle_times(board_id, today))
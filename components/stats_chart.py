@@ -0,0 +1,135 @@
+import functools
+
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+import database as db
+import profiling
+
+
+STATUS_COLORS = {"To Do": "#6366f1", "In Progress": "#f59e0b", "Done": "#10b981"}
+# Liczba zapamiętanych wykresów (wspólna dla wszystkich sesji procesu)
+CHART_CACHE_SIZE = 64
+
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def _status_figure(counts: tuple[tuple[str, int], ...]) -> go.Figure:
+    """Buduje wykres dla krotki (status, liczba). Wynik jest współdzielony - nie modyfikować."""
+    with profiling.span("build"):
+        names = [name for name, _ in counts]
+        fig = px.pie(
+            values=[count for _, count in counts],
+            names=names,
+            color=names,
+            color_discrete_map=STATUS_COLORS,
+            hole=0.45,
+        )
+        fig.update_layout(
+            margin=dict(t=0, b=0, l=0, r=0),
+            height=180,
+            showlegend=False,
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="white", size=11),
+        )
+        fig.update_traces(
+            textinfo="label+value",
+            textfont_size=11,
+            marker=dict(line=dict(color="#1a1a2e", width=2)),
+        )
+    return fig
+
+
+def render_status_chart(status_counts: dict[str, int]) -> None:
+    """Renderuje wykres kołowy liczby zadań per status.
+
+    Figura jest budowana tylko przy nowym zestawie liczników; przy tych
+    samych licznikach zostaje jedynie serializacja po stronie Streamlit.
+    """
+    with profiling.span("chart"):
+        fig = _status_figure(tuple(status_counts.items()))
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def _cycle_time_labels() -> tuple[str, ...]:
+    """Etykiety przedziałów CYCLE_TIME_BUCKETS, np. "<1 d", "2–3 d", "31+ d"."""
+    bounds = db.CYCLE_TIME_BUCKETS
+    labels = [f"<{bounds[0]} d"]
+    for low, high in zip(bounds, bounds[1:]):
+        labels.append(f"{low} d" if high - low == 1 else f"{low}–{high - 1} d")
+    labels.append(f"{bounds[-1]}+ d")
+    return tuple(labels)
+
+
+def _chart_layout(fig: go.Figure, height: int) -> None:
+    fig.update_layout(
+        margin=dict(t=0, b=0, l=0, r=0),
+        height=height,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="white", size=11),
+    )
+
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def _flow_figure(
+    days: tuple[str, ...], wip: tuple[tuple[str, tuple[int, ...]], ...]
+) -> go.Figure:
+    """Wykres skumulowanego przepływu (CFD): pasma statusów, Done na dole."""
+    with profiling.span("build"):
+        fig = go.Figure()
+        for status, values in reversed(wip):
+            fig.add_trace(go.Scatter(
+                x=days,
+                y=values,
+                name=status,
+                mode="lines",
+                stackgroup="flow",
+                line=dict(width=0.5, color=STATUS_COLORS.get(status)),
+            ))
+        _chart_layout(fig, 200)
+        fig.update_layout(
+            legend=dict(orientation="h", y=-0.2),
+            xaxis=dict(showgrid=False),
+            yaxis=dict(gridcolor="#333"),
+        )
+    return fig
+
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def _cycle_time_figure(counts: tuple[int, ...]) -> go.Figure:
+    """Histogram czasu cyklu (przedziały CYCLE_TIME_BUCKETS)."""
+    with profiling.span("build"):
+        fig = go.Figure(go.Bar(
+            x=_cycle_time_labels(),
+            y=counts,
+            marker_color=STATUS_COLORS["Done"],
+        ))
+        _chart_layout(fig, 160)
+        fig.update_layout(showlegend=False, yaxis=dict(gridcolor="#333"))
+    return fig
+
+
+def render_flow_charts(flow: dict, cycle_times: list[int]) -> None:
+    """Renderuje CFD i histogram czasu cyklu (dane z db.get_flow / db.get_cycle_times)."""
+    with profiling.span("flow"):
+        completed = sum(flow["throughput"])
+        days = len(flow["days"])
+        st.caption(
+            f"Ukończone w ostatnich {days} dniach: {completed} "
+            f"(średnio {completed / days:.1f} dziennie)"
+        )
+        wip = tuple((status, tuple(values)) for status, values in flow["wip"].items())
+        st.plotly_chart(_flow_figure(tuple(flow["days"]), wip), use_container_width=True)
+
+        st.caption("Czas cyklu (od rozpoczęcia do ukończenia)")
+        if any(cycle_times):
+            st.plotly_chart(_cycle_time_figure(tuple(cycle_times)), use_container_width=True)
+        else:
+            st.caption("Brak ukończonych zadań w tym okresie.")
+
+
+def chart_cache_info() -> dict:
+    info = _status_figure.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
@@ -0,0 +1,20 @@
+import functools
+import re
+from pathlib import Path
+
+CSS_PATH = Path(__file__).resolve().parent.parent / "assets" / "style.css"
+
+
+@functools.cache
+def load_css() -> str:
+    """Zwraca blok <style> z assets/style.css - plik jest czytany i minifikowany raz na proces.
+
+    Streamlit usuwa elementy, których pełny rerun nie wyrenderował ponownie,
+    więc blok i tak jest wysyłany przy każdym pełnym rerunie - dlatego jest
+    możliwie mały. Reruny fragmentów go nie wysyłają.
+    """
+    css = CSS_PATH.read_text(encoding="utf-8")
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return f"<style>{css.strip()}</style>"
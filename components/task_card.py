@@ -1,13 +1,16 @@
+from datetime import date
+from typing import Optional
+
 from models import Task
 
 
-def render_task_card(task: Task) -> str:
+def render_task_card(task: Task, today: Optional[date] = None) -> str:
     """Zwraca tekst karty zadania dla sortable container."""
     parts = [f"{task.priority_icon} {task.title}"]
 
     if task.deadline:
         dl_str = task.deadline.strftime("%d.%m")
-        if task.is_overdue:
+        if task.is_overdue(today):
             parts.append(f"-- {dl_str} !")
         else:
             parts.append(f"-- {dl_str}")
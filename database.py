@@ -1,21 +1,321 @@
+import csv
+import functools
+import itertools
+import json
+import os
+import queue
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from models import Task
+from concurrent.futures import Future
+from typing import Iterable, Iterator, Optional, TextIO
 
-DB_PATH = Path(__file__).parent / "kanban.db"
+import profiling
+from writer import Writer
+from models import Task, STATUSES, PRIORITIES, DEFAULT_BOARD_ID, DEADLINE_FILTERS, deadline_bounds
+from task_table import TaskTable, STATUS_CODES, PRIORITY_CODES, NO_DEADLINE
+
+# KANBAN_DB pozwala wskazać inną bazę (np. syntetyczną w benchmarkach)
+DB_PATH = Path(os.environ.get("KANBAN_DB") or Path(__file__).parent / "kanban.db")
+
+# Pula połączeń: ile połączeń trzymamy otwartych na jedną bazę
+POOL_SIZE = 8
+# Ile ms czekamy na blokadę zapisu zanim SQLite zgłosi "database is locked"
+BUSY_TIMEOUT_MS = 5000
+# Cache prepared statements (per połączenie)
+STATEMENT_CACHE_SIZE = 256
+
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",  # ~16 MB
+    "PRAGMA mmap_size = 268435456",  # 256 MB
+    "PRAGMA temp_store = MEMORY",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+)
+
+_pools: dict[str, queue.LifoQueue] = {}
+_pools_lock = threading.Lock()
+_writers: dict[str, Writer] = {}
 
 
 def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(DB_PATH))
+    """Otwiera nowe, skonfigurowane połączenie (poza pulą)."""
+    conn = sqlite3.connect(
+        str(DB_PATH),
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        # Z KANBAN_PROFILE=1 zapytania są liczone i mierzone
+        factory=profiling.ProfiledConnection if profiling.ENABLED else sqlite3.Connection,
+    )
     conn.row_factory = sqlite3.Row
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
+def _get_pool() -> queue.LifoQueue:
+    key = str(DB_PATH)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, queue.LifoQueue(maxsize=POOL_SIZE))
+    return pool
+
+
+@contextmanager
+def connection() -> Iterator[sqlite3.Connection]:
+    """Wypożycza połączenie z puli procesu i oddaje je po użyciu.
+
+    Pula jest modułowa, więc jest współdzielona przez wszystkie sesje
+    Streamlita w procesie. Transakcje obsługuje `with conn:`.
+    """
+    pool = _get_pool()
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = get_connection()
+    try:
+        yield conn
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        try:
+            pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def close_connections() -> None:
+    """Zamyka wszystkie połączenia z puli (np. przy zmianie DB_PATH w testach).
+
+    Najpierw zapisuje wszystko, co czeka w kolejkach wątków zapisu. Czyści
+    też cache odczytów - licznik data_version nowego połączenia-obserwatora
+    zaczyna się od nowa i mógłby trafić w wersję zapisaną w cache.
+    """
+    global _cache_version
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+    with _live_lock:
+        _live_tables.clear()
+    with _migrate_lock:
+        _migrated.clear()
+    with _cache_lock:
+        for watcher in _watchers.values():
+            watcher.close()
+        _watchers.clear()
+        _cache.clear()
+        _cache_version = None
+    for pool in pools:
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# --- Zapisy ------------------------------------------------------------------
+# Wszystkie mutatory idą przez jeden wątek zapisu na bazę (writer.py), który
+# łączy operacje zgłoszone w tym samym czasie w jeden commit. Sesje nie
+# konkurują więc o blokadę zapisu SQLite.
+
+def _get_writer() -> Writer:
+    key = str(DB_PATH)
+    writer = _writers.get(key)
+    if writer is None:
+        with _pools_lock:
+            writer = _writers.get(key)
+            if writer is None:
+                writer = _writers[key] = Writer(get_connection)
+    return writer
+
+
+def _writes(func):
+    """Zamienia `func(conn, ...)` w mutator wykonywany przez wątek zapisu.
+
+    `func(...)` czeka na commit i zwraca wynik (albo rzuca wyjątek operacji);
+    `func.submit(...)` zwraca od razu Future, na który można poczekać lub nie.
+    """
+    def submit(*args, **kwargs) -> Future:
+        return _get_writer().submit(func, *args, **kwargs)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return submit(*args, **kwargs).result()
+
+    wrapper.submit = submit
+    return wrapper
+
+
+def flush_writes(timeout: Optional[float] = None) -> None:
+    """Czeka, aż wszystkie zlecone zapisy zostaną zatwierdzone."""
+    _get_writer().flush(timeout)
+
+
+def writer_stats() -> dict:
+    """Liczba operacji, commitów (partii) i nieudanych operacji wątku zapisu."""
+    return dict(_get_writer().stats)
+
+
+# --- Cache odczytów ---------------------------------------------------------
+# Wyniki zapytań są współdzielone przez wszystkie sesje i unieważniane, gdy
+# zmieni się `PRAGMA data_version`. Osobne połączenie "obserwatora" nigdy nie
+# zapisuje, więc jego data_version rośnie przy każdym commicie dowolnego
+# innego połączenia - także z innych procesów.
+
+CACHE_MAX_ENTRIES = 512
+
+_cache: dict = {}
+_cache_version: Optional[tuple] = None
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+_watchers: dict[str, sqlite3.Connection] = {}
+
+
+def _data_version() -> tuple:
+    key = str(DB_PATH)
+    with _cache_lock:
+        watcher = _watchers.get(key)
+        if watcher is None:
+            watcher = _watchers[key] = get_connection()
+        return key, watcher.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _freeze(value):
+    """Zamienia argumenty (np. słownik filtrów) na hashowalny klucz cache."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _cached(func):
+    """Cache'uje wynik funkcji odczytu do czasu następnej zmiany danych.
+
+    Zwracane obiekty są współdzielone między sesjami - nie wolno ich modyfikować.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global _cache_version
+        version = _data_version()
+        key = (func.__name__, _freeze(args), _freeze(kwargs))
+        with _cache_lock:
+            if version != _cache_version:
+                if _cache:
+                    _cache_stats["invalidations"] += 1
+                _cache.clear()
+                _cache_version = version
+            elif key in _cache:
+                _cache_stats["hits"] += 1
+                return _cache[key]
+            _cache_stats["misses"] += 1
+
+        result = func(*args, **kwargs)
+
+        with _cache_lock:
+            if version == _cache_version:
+                if len(_cache) >= CACHE_MAX_ENTRIES:
+                    _cache.clear()
+                _cache[key] = result
+        return result
+    return wrapper
+
+
+def cache_info() -> dict:
+    """Statystyki cache odczytów: trafienia, chybienia, unieważnienia, rozmiar."""
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_cache)}
+
+
+# --- Schemat i migracje -------------------------------------------------------
+# Wersja schematu to PRAGMA user_version = liczba wykonanych kroków MIGRATIONS.
+# Kroki są wykonywane po kolei, raz na bazę; zmiana schematu to NOWY krok
+# dopisany na końcu listy (istniejących kroków się nie zmienia). Kroki są
+# idempotentne, bo bazy sprzed wersjonowania (user_version = 0) mogą mieć
+# już część schematu.
+
+_migrated: set[str] = set()
+_migrate_lock = threading.Lock()
+
+
 def init_db() -> None:
-    conn = get_connection()
-    conn.execute("""
+    """Doprowadza schemat bazy do bieżącej wersji (w procesie - tylko raz na bazę).
+
+    Kolejne wywołania (np. na każdym rerunie) to tylko sprawdzenie zbioru.
+    """
+    key = str(DB_PATH)
+    if key in _migrated:
+        return
+    with _migrate_lock:
+        if key in _migrated:
+            return
+        with connection() as conn:
+            _migrate(conn)
+        _migrated.add(key)
+
+
+def _user_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Wykonuje brakujące kroki MIGRATIONS w jednej transakcji.
+
+    BEGIN IMMEDIATE bierze blokadę zapisu przed odczytem wersji, więc przy
+    kilku procesach startujących naraz migruje tylko pierwszy - pozostałe
+    czekają (busy_timeout), widzą nową wersję i nic nie robią.
+    """
+    if _user_version(conn) >= SCHEMA_VERSION:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = _user_version(conn)
+        for number, step in enumerate(MIGRATIONS[version:], version + 1):
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _run_script(conn: sqlite3.Connection, script: str) -> None:
+    """Jak executescript, ale bez niejawnego COMMIT - w bieżącej transakcji migracji."""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    return [row["name"] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+# Nazwa tablicy tworzonej przy inicjalizacji bazy
+DEFAULT_BOARD_NAME = "Moja tablica"
+
+
+def _create_tasks(conn: sqlite3.Connection) -> None:
+    """Tabela zadań (z migracjami sprzed wersjonowania schematu)."""
+    conn.execute(f"""
         CREATE TABLE IF NOT EXISTS tasks (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
+            board_id INTEGER NOT NULL DEFAULT {DEFAULT_BOARD_ID} REFERENCES boards (id),
             title TEXT NOT NULL,
             status TEXT NOT NULL DEFAULT 'To Do',
             priority TEXT NOT NULL DEFAULT 'Średni',
@@ -25,92 +325,1522 @@ def init_db() -> None:
         )
     """)
     # Migracja: category -> description (dla istniejących baz)
-    columns = [row["name"] for row in conn.execute("PRAGMA table_info(tasks)").fetchall()]
+    columns = _columns(conn, "tasks")
     if "category" in columns and "description" not in columns:
         conn.execute("ALTER TABLE tasks RENAME COLUMN category TO description")
-    conn.commit()
-    conn.close()
+    # Migracja: zadania sprzed podziału na tablice trafiają do tablicy domyślnej
+    if "board_id" not in columns:
+        conn.execute(
+            "ALTER TABLE tasks ADD COLUMN board_id INTEGER NOT NULL "
+            f"DEFAULT {DEFAULT_BOARD_ID} REFERENCES boards (id)"
+        )
+
+
+def _create_boards(conn: sqlite3.Connection) -> None:
+    """Tabela tablic (boards) z tablicą domyślną."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'boards'"
+    ).fetchone()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS boards (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            created_at TEXT NOT NULL
+        )
+    """)
+    if not exists:
+        conn.execute(
+            "INSERT INTO boards (id, name, created_at) VALUES (?, ?, ?)",
+            (DEFAULT_BOARD_ID, DEFAULT_BOARD_NAME, datetime.now().isoformat()),
+        )
+
+
+def _create_ranks(conn: sqlite3.Connection) -> None:
+    """Kolumna rank: kolejność kart w kolumnie (ranga ułamkowa)."""
+    if "rank" not in _columns(conn, "tasks"):
+        conn.execute("ALTER TABLE tasks ADD COLUMN rank REAL NOT NULL DEFAULT 0")
+        # Dotychczasowa kolejność to kolejność id
+        conn.execute("UPDATE tasks SET rank = id")
+
+
+def _create_indexes(conn: sqlite3.Connection) -> None:
+    """Indeksy złożone zaczynają się od board_id - zapytania tablicy czytają tylko jej wiersze."""
+    # Indeksy sprzed podziału na tablice
+    conn.execute("DROP INDEX IF EXISTS idx_tasks_status_priority_deadline")
+    conn.execute("DROP INDEX IF EXISTS idx_tasks_status_rank")
+    # Filtry kolumny (status + priorytet) i zadania po terminie
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_board_status_priority_deadline "
+        "ON tasks (board_id, status, priority, deadline)"
+    )
+    # Kolejność kart w kolumnie, paginacja i koniec kolumny (MAX(rank))
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_board_status_rank ON tasks (board_id, status, rank)"
+    )
+    # Widoki terminów (po terminie / na dziś / wkrótce) - zakres po deadline w kolumnie
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_board_status_deadline "
+        "ON tasks (board_id, status, deadline) WHERE deadline IS NOT NULL"
+    )
+
+
+def _create_counters(conn: sqlite3.Connection) -> None:
+    """Tabela liczników zadań per (tablica, status), utrzymywana przez triggery."""
+    columns = _columns(conn, "task_counts")
+    if columns and "board_id" not in columns:
+        # Liczniki sprzed podziału na tablice - przebudowa razem z triggerami
+        for trigger in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_tasks_count_{trigger}")
+        conn.execute("DROP TABLE task_counts")
+        columns = []
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS task_counts (
+            board_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (board_id, status)
+        ) WITHOUT ROWID
+    """)
+    _run_script(conn, """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_count_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO task_counts (board_id, status, total) VALUES (NEW.board_id, NEW.status, 1)
+            ON CONFLICT (board_id, status) DO UPDATE SET total = total + 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_count_delete AFTER DELETE ON tasks
+        BEGIN
+            UPDATE task_counts SET total = total - 1
+            WHERE board_id = OLD.board_id AND status = OLD.status;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_count_update AFTER UPDATE OF status, board_id ON tasks
+        WHEN OLD.status != NEW.status OR OLD.board_id != NEW.board_id
+        BEGIN
+            UPDATE task_counts SET total = total - 1
+            WHERE board_id = OLD.board_id AND status = OLD.status;
+            INSERT INTO task_counts (board_id, status, total) VALUES (NEW.board_id, NEW.status, 1)
+            ON CONFLICT (board_id, status) DO UPDATE SET total = total + 1;
+        END;
+    """)
+    if not columns:
+        # Pierwsze uruchomienie na istniejącej bazie - jednorazowe przeliczenie
+        conn.execute(
+            "INSERT INTO task_counts (board_id, status, total) "
+            "SELECT board_id, status, COUNT(*) FROM tasks GROUP BY board_id, status"
+        )
+
+
+_TASK_COLUMNS = "id, title, status, priority, description, deadline, created_at, rank, board_id"
+
+
+def _create_search_index(conn: sqlite3.Connection) -> None:
+    """Indeks pełnotekstowy FTS5 (tytuł + opis) synchronizowany triggerami."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+    ).fetchone()
+    _run_script(conn, """
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            title,
+            description,
+            content = 'tasks',
+            content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (rowid, title, description)
+            VALUES (NEW.id, NEW.title, NEW.description);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_delete AFTER DELETE ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+            VALUES ('delete', OLD.id, OLD.title, OLD.description);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_update AFTER UPDATE OF title, description ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+            VALUES ('delete', OLD.id, OLD.title, OLD.description);
+            INSERT INTO tasks_fts (rowid, title, description)
+            VALUES (NEW.id, NEW.title, NEW.description);
+        END;
+    """)
+    if not exists:
+        conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+# Dziennik zmian: ile ostatnich wpisów zostaje i co ile wpisów go przycinamy
+CHANGE_LOG_KEEP = 10_000
+CHANGE_LOG_PRUNE_EVERY = 1_000
+
+
+def _create_change_log(conn: sqlite3.Connection) -> None:
+    """Dziennik zmian zadań (tylko dopisywany), wypełniany przez triggery.
+
+    Każdy zapis zadania dopisuje (seq, board_id, task_id). Rodzaj zmiany
+    wynika z bieżącego stanu tabeli tasks: brak wiersza = usunięte.
+    Dziennik przycina się sam - zostaje ostatnie CHANGE_LOG_KEEP wpisów.
+    """
+    _run_script(conn, f"""
+        CREATE TABLE IF NOT EXISTS task_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            board_id INTEGER NOT NULL,
+            task_id INTEGER NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_task_changes_board_seq ON task_changes (board_id, seq);
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_change_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO task_changes (board_id, task_id) VALUES (NEW.board_id, NEW.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_change_delete AFTER DELETE ON tasks
+        BEGIN
+            INSERT INTO task_changes (board_id, task_id) VALUES (OLD.board_id, OLD.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_change_update AFTER UPDATE ON tasks
+        BEGIN
+            INSERT INTO task_changes (board_id, task_id) VALUES (NEW.board_id, NEW.id);
+            -- Przeniesienie na inną tablicę to dla starej tablicy usunięcie
+            INSERT INTO task_changes (board_id, task_id)
+            SELECT OLD.board_id, OLD.id WHERE OLD.board_id != NEW.board_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_task_changes_prune AFTER INSERT ON task_changes
+        WHEN NEW.seq % {CHANGE_LOG_PRUNE_EVERY} = 0
+        BEGIN
+            DELETE FROM task_changes WHERE seq <= NEW.seq - {CHANGE_LOG_KEEP};
+        END;
+    """)
+
+
+# Znacznik czasu w formacie datetime.isoformat() liczony po stronie SQLite
+_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+
+def _create_archive(conn: sqlite3.Connection) -> None:
+    """Kolumna completed_at (utrzymywana triggerami) i tabela tasks_archive."""
+    if "completed_at" not in _columns(conn, "tasks"):
+        conn.execute("ALTER TABLE tasks ADD COLUMN completed_at TEXT")
+        # Data ukończenia starych zadań nie jest znana - wiek liczymy od migracji
+        conn.execute(
+            "UPDATE tasks SET completed_at = ? WHERE status = 'Done'",
+            (datetime.now().isoformat(),),
+        )
+    # Tylko zadania ukończone - kandydaci do archiwizacji
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_board_completed "
+        "ON tasks (board_id, completed_at) WHERE completed_at IS NOT NULL"
+    )
+    _run_script(conn, f"""
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_completed_insert AFTER INSERT ON tasks
+        WHEN NEW.status = 'Done' AND NEW.completed_at IS NULL
+        BEGIN
+            UPDATE tasks SET completed_at = {_NOW_SQL} WHERE id = NEW.id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_completed_update AFTER UPDATE OF status ON tasks
+        WHEN OLD.status != NEW.status
+        BEGIN
+            UPDATE tasks
+            SET completed_at = CASE WHEN NEW.status = 'Done' THEN {_NOW_SQL} END
+            WHERE id = NEW.id;
+        END;
+
+        CREATE TABLE IF NOT EXISTS tasks_archive (
+            id INTEGER PRIMARY KEY,
+            board_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            status TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            description TEXT DEFAULT '',
+            deadline TEXT,
+            created_at TEXT NOT NULL,
+            rank REAL NOT NULL DEFAULT 0,
+            completed_at TEXT,
+            archived_at TEXT NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_tasks_archive_board ON tasks_archive (board_id);
+    """)
+
+
+# Dzień agregatów ze stanem zastanym przy migracji (wcześniejszy niż każda data)
+_FLOW_BASELINE_DAY = "0001-01-01"
+# Przedziały histogramu czasu cyklu: górne granice w dniach (granica należy już
+# do następnego przedziału); ostatni przedział jest otwarty
+CYCLE_TIME_BUCKETS = (1, 2, 4, 8, 15, 31)
+
+
+def _create_flow_metrics(conn: sqlite3.Connection) -> None:
+    """Historia przejść między statusami i dzienne agregaty przepływu.
+
+    Każde przejście trafia do task_events; trigger na task_events od razu
+    dolicza je do agregatów (flow_daily, cycle_time_daily), więc wykresy
+    czytają tylko agregaty - ich koszt nie zależy od liczby zdarzeń.
+    Archiwizacja i przywracanie nie są przejściami: zadanie w archiwum
+    dalej liczy się jako Done.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'flow_daily'"
+    ).fetchone()
+    # Czas cyklu w przedziale: liczba granic, które przekroczył
+    bucket = " + ".join(f"(days >= {bound})" for bound in CYCLE_TIME_BUCKETS)
+    _run_script(conn, f"""
+        CREATE TABLE IF NOT EXISTS task_events (
+            seq INTEGER PRIMARY KEY,
+            board_id INTEGER NOT NULL,
+            task_id INTEGER NOT NULL,
+            from_status TEXT,  -- NULL: zadanie utworzone lub przeniesione z innej tablicy
+            to_status TEXT,  -- NULL: zadanie usunięte lub przeniesione na inną tablicę
+            at TEXT NOT NULL
+        );
+
+        -- Początek pracy nad zadaniem (MIN(at) dla 'In Progress') przy liczeniu czasu cyklu
+        CREATE INDEX IF NOT EXISTS idx_task_events_task ON task_events (task_id, to_status, at);
+
+        CREATE TABLE IF NOT EXISTS flow_daily (
+            board_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            status TEXT NOT NULL,
+            arrivals INTEGER NOT NULL DEFAULT 0,
+            departures INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (board_id, day, status)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS cycle_time_daily (
+            board_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (board_id, day, bucket)
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_event_insert AFTER INSERT ON tasks
+        WHEN NOT EXISTS (SELECT 1 FROM tasks_archive WHERE id = NEW.id)
+        BEGIN
+            INSERT INTO task_events (board_id, task_id, from_status, to_status, at)
+            VALUES (NEW.board_id, NEW.id, NULL, NEW.status, {_NOW_SQL});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_event_delete AFTER DELETE ON tasks
+        WHEN NOT EXISTS (SELECT 1 FROM tasks_archive WHERE id = OLD.id)
+        BEGIN
+            INSERT INTO task_events (board_id, task_id, from_status, to_status, at)
+            VALUES (OLD.board_id, OLD.id, OLD.status, NULL, {_NOW_SQL});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_event_update AFTER UPDATE OF status, board_id ON tasks
+        WHEN OLD.status != NEW.status OR OLD.board_id != NEW.board_id
+        BEGIN
+            INSERT INTO task_events (board_id, task_id, from_status, to_status, at)
+            SELECT NEW.board_id, NEW.id, OLD.status, NEW.status, {_NOW_SQL}
+            WHERE OLD.board_id = NEW.board_id;
+            -- Przeniesienie między tablicami: wyjście ze starej i wejście na nową
+            INSERT INTO task_events (board_id, task_id, from_status, to_status, at)
+            SELECT OLD.board_id, OLD.id, OLD.status, NULL, {_NOW_SQL}
+            WHERE OLD.board_id != NEW.board_id;
+            INSERT INTO task_events (board_id, task_id, from_status, to_status, at)
+            SELECT NEW.board_id, NEW.id, NULL, NEW.status, {_NOW_SQL}
+            WHERE OLD.board_id != NEW.board_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_task_events_flow AFTER INSERT ON task_events
+        BEGIN
+            INSERT INTO flow_daily (board_id, day, status, arrivals)
+            SELECT NEW.board_id, substr(NEW.at, 1, 10), NEW.to_status, 1
+            WHERE NEW.to_status IS NOT NULL
+            ON CONFLICT (board_id, day, status) DO UPDATE SET arrivals = arrivals + 1;
+            INSERT INTO flow_daily (board_id, day, status, departures)
+            SELECT NEW.board_id, substr(NEW.at, 1, 10), NEW.from_status, 1
+            WHERE NEW.from_status IS NOT NULL
+            ON CONFLICT (board_id, day, status) DO UPDATE SET departures = departures + 1;
+        END;
+
+        -- Czas cyklu: od pierwszego wejścia do 'In Progress' do ukończenia
+        CREATE TRIGGER IF NOT EXISTS trg_task_events_cycle_time AFTER INSERT ON task_events
+        WHEN NEW.to_status = 'Done' AND NEW.from_status IS NOT NULL
+        BEGIN
+            INSERT INTO cycle_time_daily (board_id, day, bucket, total)
+            SELECT NEW.board_id, substr(NEW.at, 1, 10), {bucket}, 1
+            FROM (
+                SELECT julianday(NEW.at) - julianday(MIN(at)) AS days
+                FROM task_events WHERE task_id = NEW.task_id AND to_status = 'In Progress'
+            )
+            WHERE days IS NOT NULL
+            ON CONFLICT (board_id, day, bucket) DO UPDATE SET total = total + 1;
+        END;
+    """)
+    if not exists:
+        # Historia zaczyna się od migracji: bieżący stan jako stan początkowy
+        # (dzień sprzed wszystkich dat - nie wygląda na wejścia w żadnym dniu)
+        conn.execute(f"""
+            INSERT INTO flow_daily (board_id, day, status, arrivals)
+            SELECT board_id, '{_FLOW_BASELINE_DAY}', status, COUNT(*)
+            FROM (
+                SELECT board_id, status FROM tasks
+                UNION ALL
+                SELECT board_id, status FROM tasks_archive
+            )
+            GROUP BY board_id, status
+        """)
+
+
+def _scope_search_index(conn: sqlite3.Connection) -> None:
+    """Indeks FTS5 z tablicą zadania jako dodatkową kolumną (token `b<id>`).
+
+    Wyszukiwanie łączy frazę z tokenem tablicy w jednym MATCH, więc FTS5
+    przegląda tylko dopasowania z tej tablicy zamiast całego indeksu.
+    Treść indeksu pochodzi z widoku nad `tasks`; ranking (bm25) pomija
+    kolumnę tablicy.
+    """
+    if "board" in _columns(conn, "tasks_fts"):
+        return
+    _run_script(conn, """
+        DROP TRIGGER IF EXISTS trg_tasks_fts_insert;
+        DROP TRIGGER IF EXISTS trg_tasks_fts_delete;
+        DROP TRIGGER IF EXISTS trg_tasks_fts_update;
+        DROP TABLE IF EXISTS tasks_fts;
+
+        CREATE VIEW IF NOT EXISTS tasks_fts_source AS
+        SELECT id, title, description, 'b' || board_id AS board FROM tasks;
+
+        CREATE VIRTUAL TABLE tasks_fts USING fts5(
+            title,
+            description,
+            board,
+            content = 'tasks_fts_source',
+            content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        );
+
+        CREATE TRIGGER trg_tasks_fts_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (rowid, title, description, board)
+            VALUES (NEW.id, NEW.title, NEW.description, 'b' || NEW.board_id);
+        END;
+
+        CREATE TRIGGER trg_tasks_fts_delete AFTER DELETE ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description, board)
+            VALUES ('delete', OLD.id, OLD.title, OLD.description, 'b' || OLD.board_id);
+        END;
+
+        CREATE TRIGGER trg_tasks_fts_update AFTER UPDATE OF title, description, board_id ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description, board)
+            VALUES ('delete', OLD.id, OLD.title, OLD.description, 'b' || OLD.board_id);
+            INSERT INTO tasks_fts (rowid, title, description, board)
+            VALUES (NEW.id, NEW.title, NEW.description, 'b' || NEW.board_id);
+        END;
+    """)
+    conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('rank', 'bm25(1.0, 1.0, 0.0)')")
+
+
+def _count_completions(conn: sqlite3.Connection) -> None:
+    """Kolumna flow_daily.completed: ukończenia, czyli przejścia do Done z innego statusu.
+
+    Przepustowość liczona z przyjść do Done liczyłaby też zadania dodane
+    (lub zaimportowane, przeniesione z innej tablicy) od razu jako Done.
+    """
+    if "completed" in _columns(conn, "flow_daily"):
+        return
+    conn.execute("ALTER TABLE flow_daily ADD COLUMN completed INTEGER NOT NULL DEFAULT 0")
+    _run_script(conn, """
+        DROP TRIGGER IF EXISTS trg_task_events_flow;
+
+        CREATE TRIGGER trg_task_events_flow AFTER INSERT ON task_events
+        BEGIN
+            INSERT INTO flow_daily (board_id, day, status, arrivals, completed)
+            SELECT NEW.board_id, substr(NEW.at, 1, 10), NEW.to_status, 1,
+                   NEW.to_status = 'Done' AND NEW.from_status IS NOT NULL
+            WHERE NEW.to_status IS NOT NULL
+            ON CONFLICT (board_id, day, status) DO UPDATE
+            SET arrivals = arrivals + 1, completed = completed + excluded.completed;
+            INSERT INTO flow_daily (board_id, day, status, departures)
+            SELECT NEW.board_id, substr(NEW.at, 1, 10), NEW.from_status, 1
+            WHERE NEW.from_status IS NOT NULL
+            ON CONFLICT (board_id, day, status) DO UPDATE SET departures = departures + 1;
+        END;
+    """)
+    # Ukończenia zapisane przed tym krokiem - z historii przejść
+    conn.execute("""
+        INSERT INTO flow_daily (board_id, day, status, completed)
+        SELECT board_id, substr(at, 1, 10), 'Done', COUNT(*) FROM task_events
+        WHERE to_status = 'Done' AND from_status IS NOT NULL
+        GROUP BY board_id, substr(at, 1, 10)
+        ON CONFLICT (board_id, day, status) DO UPDATE SET completed = excluded.completed
+    """)
+
+
+# Kroki migracji w kolejności wykonywania - nowe kroki tylko na końcu
+MIGRATIONS = (
+    _create_boards,
+    _create_tasks,
+    _create_ranks,
+    _create_indexes,
+    _create_counters,
+    _create_search_index,
+    _create_change_log,
+    _create_archive,
+    _create_flow_metrics,
+    _scope_search_index,
+    _count_completions,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
 
 
 def _row_to_task(row: sqlite3.Row) -> Task:
-    from datetime import date as d
-    deadline = None
-    if row["deadline"]:
-        deadline = d.fromisoformat(row["deadline"])
+    # Termin zostaje tekstem ISO - Task parsuje go leniwie
     return Task(
         id=row["id"],
         title=row["title"],
         status=row["status"],
         priority=row["priority"],
         description=row["description"] or "",
-        deadline=deadline,
+        deadline=row["deadline"],
         created_at=row["created_at"],
+        rank=row["rank"],
+        board_id=row["board_id"],
     )
 
 
-def get_all_tasks() -> list[Task]:
-    conn = get_connection()
-    rows = conn.execute("SELECT * FROM tasks ORDER BY id").fetchall()
-    conn.close()
-    return [_row_to_task(r) for r in rows]
+def _task_factory(cursor: sqlite3.Cursor, row: tuple) -> Task:
+    """row_factory budujący Task wprost z krotki (kolumny jak w _TASK_COLUMNS)."""
+    return Task(row[0], row[1], row[2], row[3], row[4] or "", row[5], row[6], row[7], row[8])
+
+
+def _fetch_tasks(conn: sqlite3.Connection, sql: str, params=()) -> list[Task]:
+    cursor = conn.cursor()
+    cursor.row_factory = _task_factory
+    return cursor.execute(sql, params).fetchall()
+
+
+# --- Tablice -----------------------------------------------------------------
+
+@_cached
+def get_boards() -> dict[int, str]:
+    """Zwraca {id: nazwa} wszystkich tablic (w kolejności utworzenia)."""
+    with connection() as conn:
+        rows = conn.execute("SELECT id, name FROM boards ORDER BY id")
+        return {row["id"]: row["name"] for row in rows}
+
+
+@_writes
+def add_board(conn: sqlite3.Connection, name: str) -> int:
+    """Tworzy nową tablicę. Rzuca ValueError przy pustej lub zajętej nazwie."""
+    name = name.strip()
+    if not name:
+        raise ValueError("nazwa tablicy nie może być pusta")
+    try:
+        cursor = conn.execute(
+            "INSERT INTO boards (name, created_at) VALUES (?, ?)",
+            (name, datetime.now().isoformat()),
+        )
+    except sqlite3.IntegrityError:
+        raise ValueError(f"tablica {name!r} już istnieje") from None
+    return cursor.lastrowid
+
+
+# --- Odczyty (zawsze w obrębie jednej tablicy) ---------------------------------
+
+@_cached
+def get_all_tasks(board_id: int) -> list[Task]:
+    with connection() as conn:
+        return _fetch_tasks(
+            conn, f"SELECT {_TASK_COLUMNS} FROM tasks WHERE board_id = ? ORDER BY id", (board_id,)
+        )
+
+
+@_cached
+def get_tasks_by_status(board_id: int, status: str) -> list[Task]:
+    with connection() as conn:
+        return _fetch_tasks(
+            conn,
+            f"SELECT {_TASK_COLUMNS} FROM tasks WHERE board_id = ? AND status = ? ORDER BY rank, id",
+            (board_id, status),
+        )
+
+
+def _fts_query(board_id: int, text: str) -> Optional[str]:
+    """Zamienia tekst z pola wyszukiwania na zapytanie FTS5 w obrębie tablicy.
+
+    Każde słowo to prefiks szukany w tytule i opisie; token `b<id>` z kolumny
+    `board` zawęża dopasowania do tablicy już w indeksie.
+    """
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    phrase = " ".join(f'"{term}"*' for term in terms)
+    return f'board : "b{board_id}" AND {{title description}} : ({phrase})'
+
+
+@_cached
+def search_task_ids(
+    board_id: int, text: str, limit: Optional[int] = None, ranked: bool = True
+) -> list[int]:
+    """Id zadań tablicy pasujących do tekstu (prefiksy słów).
+
+    Domyślnie od najlepiej dopasowanych (bm25); `ranked=False` pomija
+    ranking, gdy liczy się tylko zbiór wyników (np. liczniki kolumn).
+    """
+    query = _fts_query(board_id, text)
+    if query is None:
+        return []
+    sql = "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?"
+    if ranked:
+        sql += " ORDER BY rank"
+    params: list = [query]
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    with connection() as conn:
+        return [r[0] for r in conn.execute(sql, params)]
+
+
+# Limit parametrów w jednym zapytaniu (SQLITE_MAX_VARIABLE_NUMBER ma zapas)
+_ID_CHUNK = 500
+# Do tylu dopasowań w kolumnie strona pobiera je po id (jedno zapytanie, w
+# limicie parametrów); przy większej liczbie przegląda kolumnę w kolejności
+# rang i odsiewa resztę (dopasowania są gęste)
+SEARCH_LOOKUP_MAX = _ID_CHUNK
+
+
+@_cached
+def _search_columns(board_id: int, text: str) -> dict[str, frozenset[int]]:
+    """Wynik wyszukiwania rozbity na kolumny tablicy.
+
+    Jedno zapytanie FTS na wersję danych (ten sam wpis cache co liczniki
+    kolumn) - strony kolumn korzystają z gotowego zbioru id.
+    """
+    ids = search_task_ids(board_id, text, ranked=False)
+    by_status = load_task_table(board_id).ids_by_status(ids)
+    return {status: frozenset(found.tolist()) for status, found in by_status.items()}
+
+
+def _search_matches(board_id: int, filters: dict, status: str) -> Optional[frozenset[int]]:
+    """Id zadań kolumny pasujących do wyszukiwania z filtrów (None = bez wyszukiwania)."""
+    search = filters.get("search")
+    if not search or _fts_query(board_id, search) is None:
+        return None
+    return _search_columns(board_id, search).get(status, frozenset())
+
+
+def _filters_sql(
+    board_id: int, filters: dict, status: str, ids: Optional[Iterable[int]] = None
+) -> tuple[str, list]:
+    """Zamienia słownik filtrów z sidebara na klauzulę WHERE i parametry.
 
+    Wyszukiwanie nie trafia do SQL - `ids` to opcjonalne zawężenie do
+    konkretnych id (dopasowań wyszukiwania).
+    """
+    clauses = ["board_id = ?", "status = ?"]
+    params: list = [board_id, status]
 
-def get_tasks_by_status(status: str) -> list[Task]:
-    conn = get_connection()
-    rows = conn.execute(
-        "SELECT * FROM tasks WHERE status = ? ORDER BY id", (status,)
-    ).fetchall()
-    conn.close()
-    return [_row_to_task(r) for r in rows]
+    if ids is not None:
+        ids = list(ids)
+        clauses.append(f"id IN ({', '.join('?' * len(ids))})")
+        params.extend(ids)
 
+    priorities = filters.get("priority")
+    if priorities:
+        clauses.append(f"priority IN ({', '.join('?' * len(priorities))})")
+        params.extend(priorities)
 
-def add_task(task: Task) -> int:
-    conn = get_connection()
+    if filters.get("deadline"):
+        start, end = deadline_bounds(filters["deadline"], filters.get("today") or date.today())
+        clauses.append("deadline < ?")
+        params.append(end.isoformat())
+        if start is not None:
+            clauses.append("deadline >= ?")
+            params.append(start.isoformat())
+
+    return " AND ".join(clauses), params
+
+
+def _is_hidden(filters: dict, status: str) -> bool:
+    # Filtry terminów dotyczą tylko zadań niezakończonych
+    return bool(filters.get("hide_done") or filters.get("deadline")) and status == "Done"
+
+
+@_cached
+def get_tasks_page(
+    board_id: int,
+    filters: dict,
+    status: str,
+    limit: Optional[int] = None,
+    after: Optional[tuple[float, int]] = None,
+) -> tuple[list[Task], Optional[tuple[float, int]]]:
+    """Zwraca stronę zadań kolumny `status` tablicy spełniających filtry, w kolejności rang.
+
+    Paginacja typu keyset: `after` to kursor z poprzedniej strony. Zwraca
+    (zadania, kursor następnej strony) - kursor jest None, gdy to ostatnia strona.
+    """
+    if _is_hidden(filters, status):
+        return [], None
+
+    matching = _search_matches(board_id, filters, status)
+    if matching is not None and not matching:
+        return [], None
+    scan = matching is not None and len(matching) > SEARCH_LOOKUP_MAX
+
+    where, params = _filters_sql(board_id, filters, status, None if scan else matching)
+    if after is not None:
+        where += " AND (rank, id) > (?, ?)"
+        params.extend(after)
+    sql = f"SELECT {_TASK_COLUMNS} FROM tasks WHERE {where} ORDER BY rank, id"
+    # Jeden wiersz nadmiarowy mówi, czy istnieje następna strona
+    wanted = limit + 1 if limit is not None else None
+    if wanted is not None and not scan:
+        sql += " LIMIT ?"
+        params.append(wanted)
+
+    with connection() as conn:
+        if scan:
+            cursor = conn.cursor()
+            cursor.row_factory = _task_factory
+            found = (task for task in cursor.execute(sql, params) if task.id in matching)
+            tasks = list(itertools.islice(found, wanted))
+        else:
+            tasks = _fetch_tasks(conn, sql, params)
+
+    next_cursor = None
+    if limit is not None and len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = (tasks[-1].rank, tasks[-1].id)
+    return tasks, next_cursor
+
+
+@_cached
+def count_tasks(board_id: int, filters: dict, status: str) -> int:
+    """Liczy zadania kolumny `status` tablicy spełniające filtry."""
+    if _is_hidden(filters, status):
+        return 0
+
+    matching = _search_matches(board_id, filters, status)
+    if matching is None:
+        chunks = [None]
+    else:
+        ids = sorted(matching)
+        chunks = [ids[i:i + _ID_CHUNK] for i in range(0, len(ids), _ID_CHUNK)]
+
+    total = 0
+    with connection() as conn:
+        for chunk in chunks:
+            where, params = _filters_sql(board_id, filters, status, chunk)
+            total += conn.execute(f"SELECT COUNT(*) FROM tasks WHERE {where}", params).fetchone()[0]
+    return total
+
+
+@_cached
+def get_stats(board_id: int, today: Optional[date] = None) -> dict:
+    """Zwraca statystyki tablicy bez przeglądania wszystkich zadań.
+
+    Liczniki statusów pochodzą z tabeli `task_counts`; liczba zadań po
+    terminie to jedno zapytanie COUNT po niezakończonych zadaniach.
+    """
+    today = today or date.today()
+    open_statuses = [s for s in STATUSES if s != "Done"]
+    with connection() as conn:
+        by_status = dict.fromkeys(STATUSES, 0)
+        for row in conn.execute(
+            "SELECT status, total FROM task_counts WHERE board_id = ?", (board_id,)
+        ):
+            by_status[row["status"]] = row["total"]
+        overdue = conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE board_id = ? "
+            f"AND status IN ({', '.join('?' * len(open_statuses))}) AND deadline < ?",
+            (board_id, *open_statuses, today.isoformat()),
+        ).fetchone()[0]
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "done": by_status.get("Done", 0),
+        "in_progress": by_status.get("In Progress", 0),
+        "overdue": overdue,
+    }
+
+
+@_cached
+def count_due(board_id: int, today: date) -> dict[str, int]:
+    """Liczba niezakończonych zadań w każdym z DEADLINE_FILTERS.
+
+    Jeden zakres po indeksie (board_id, status, deadline) - czyta tylko
+    zadania z terminem przed końcem okna "wkrótce".
+    """
+    bounds = {kind: deadline_bounds(kind, today) for kind in DEADLINE_FILTERS}
+    open_statuses = [s for s in STATUSES if s != "Done"]
+    sums, params = [], []
+    for start, end in bounds.values():
+        if start is None:
+            sums.append("IFNULL(SUM(deadline < ?), 0)")
+            params.append(end.isoformat())
+        else:
+            sums.append("IFNULL(SUM(deadline >= ? AND deadline < ?), 0)")
+            params.extend((start.isoformat(), end.isoformat()))
+    horizon = max(end for _, end in bounds.values())
+    with connection() as conn:
+        row = conn.execute(
+            f"SELECT {', '.join(sums)} FROM tasks WHERE board_id = ? "
+            f"AND status IN ({', '.join('?' * len(open_statuses))}) AND deadline < ?",
+            (*params, board_id, *open_statuses, horizon.isoformat()),
+        ).fetchone()
+    return dict(zip(bounds, row))
+
+
+def _case_codes(column: str, codes: dict[str, int]) -> str:
+    whens = " ".join(f"WHEN '{value}' THEN {code}" for value, code in codes.items())
+    return f"CASE {column} {whens} ELSE -1 END"
+
+
+# Kody statusu/priorytetu i ordinal terminu liczone po stronie SQLite
+# (julianday('0001-01-01') - 1721424.5 == date(1, 1, 1).toordinal())
+_TABLE_SQL = f"""
+    SELECT id,
+           {_case_codes("status", STATUS_CODES)},
+           {_case_codes("priority", PRIORITY_CODES)},
+           IFNULL(CAST(julianday(deadline) - 1721424.5 AS INTEGER), {NO_DEADLINE})
+    FROM tasks WHERE board_id = ? ORDER BY id
+"""
+
+
+@contextmanager
+def _snapshot() -> Iterator[sqlite3.Connection]:
+    """Połączenie w transakcji odczytu - kilka zapytań widzi ten sam stan bazy."""
+    with connection() as conn:
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.commit()
+
+
+def _last_seq(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT IFNULL(MAX(seq), 0) FROM task_changes").fetchone()[0]
+
+
+@_cached
+def latest_change(board_id: int) -> int:
+    """Numer ostatniej zmiany na tablicy (0 = brak zmian w dzienniku)."""
+    with connection() as conn:
+        return conn.execute(
+            "SELECT IFNULL(MAX(seq), 0) FROM task_changes WHERE board_id = ?", (board_id,)
+        ).fetchone()[0]
+
+
+def get_changes(board_id: int, since: int) -> Optional[tuple[int, list[Task], list[int]]]:
+    """Zmiany na tablicy po numerze `since`.
+
+    Zwraca (numer ostatniej zmiany, zmienione lub nowe zadania, id usuniętych).
+    None, gdy potrzebne wpisy zostały już usunięte z dziennika - wtedy
+    trzeba wczytać tablicę od nowa.
+    """
+    with _snapshot() as conn:
+        first = conn.execute("SELECT MIN(seq) FROM task_changes").fetchone()[0]
+        if first is not None and first > since + 1:
+            return None
+        seq = _last_seq(conn)
+        changed_ids = [
+            r[0]
+            for r in conn.execute(
+                "SELECT DISTINCT task_id FROM task_changes WHERE board_id = ? AND seq > ?",
+                (board_id, since),
+            )
+        ]
+        tasks: list[Task] = []
+        for i in range(0, len(changed_ids), _ID_CHUNK):
+            chunk = changed_ids[i:i + _ID_CHUNK]
+            tasks += _fetch_tasks(
+                conn,
+                f"SELECT {_TASK_COLUMNS} FROM tasks "
+                f"WHERE board_id = ? AND id IN ({', '.join('?' * len(chunk))})",
+                (board_id, *chunk),
+            )
+    present = {t.id for t in tasks}
+    return seq, tasks, [task_id for task_id in changed_ids if task_id not in present]
+
+
+# Widoki kolumnowe utrzymywane przyrostowo: (ścieżka bazy, tablica) -> (seq, TaskTable)
+_live_tables: dict[tuple[str, int], tuple[int, TaskTable]] = {}
+_live_lock = threading.Lock()
+
+
+def _read_task_table(board_id: int) -> tuple[int, TaskTable]:
+    with _snapshot() as conn:
+        # Rozmiar tablicy z liczników - bez dodatkowego skanu
+        count = conn.execute(
+            "SELECT IFNULL(SUM(total), 0) FROM task_counts WHERE board_id = ?", (board_id,)
+        ).fetchone()[0]
+        table = TaskTable.from_rows(conn.execute(_TABLE_SQL, (board_id,)), count=count)
+        return _last_seq(conn), table
+
+
+def load_task_table(board_id: int) -> TaskTable:
+    """Kolumnowy widok zadań tablicy (bez tworzenia obiektów Task).
+
+    Pełny odczyt tylko za pierwszym razem; potem widok jest łatany zmianami
+    z dziennika (get_changes), więc koszt zależy od liczby zmian, a nie od
+    rozmiaru tablicy. Widok jest współdzielony - nie wolno go modyfikować.
+    """
+    key = (str(DB_PATH), board_id)
+    latest = latest_change(board_id)
+    with _live_lock:
+        entry = _live_tables.get(key)
+    if entry is not None and entry[0] >= latest:
+        return entry[1]
+
+    changes = get_changes(board_id, entry[0]) if entry is not None else None
+    if changes is None:
+        seq, table = _read_task_table(board_id)
+    else:
+        seq, tasks, deleted = changes
+        table = entry[1].apply_changes(tasks, deleted)
+
+    with _live_lock:
+        current = _live_tables.get(key)
+        if current is None or current[0] < seq:
+            _live_tables[key] = (seq, table)
+    return table
+
+
+_INSERT_TASK_SQL = """INSERT INTO tasks
+                          (board_id, title, status, priority, description, deadline, created_at, rank)
+                      VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+def _task_params(task: Task) -> tuple:
+    return (
+        task.board_id,
+        task.title,
+        task.status,
+        task.priority,
+        task.description,
+        task.deadline_iso,
+        task.created_at,
+    )
+
+
+def _existing_ids(conn: sqlite3.Connection, board_id: int, task_ids: list[int]) -> set[int]:
+    """Które z `task_ids` istnieją na tablicy `board_id`."""
+    found = set()
+    for i in range(0, len(task_ids), _ID_CHUNK):
+        chunk = task_ids[i:i + _ID_CHUNK]
+        rows = conn.execute(
+            f"SELECT id FROM tasks WHERE board_id = ? AND id IN ({', '.join('?' * len(chunk))})",
+            (board_id, *chunk),
+        )
+        found.update(r[0] for r in rows)
+    return found
+
+
+# --- Rangi (kolejność w kolumnie) ---------------------------------------------
+# Ranga to liczba REAL: dopisanie na koniec to max + RANK_STEP, wstawienie
+# między dwie karty to średnia ich rang - zawsze zmienia się jeden wiersz.
+# Gdy odstęp między sąsiadami spada poniżej RANK_MIN_GAP, kolumna jest
+# w tle przenumerowywana (rebalance_ranks).
+
+RANK_STEP = 1.0
+RANK_MIN_GAP = 1e-6
+
+_rebalancing: set[tuple[str, int, str]] = set()
+_rebalancing_lock = threading.Lock()
+
+
+def rank_between(lo: Optional[float], hi: Optional[float]) -> float:
+    """Ranga pomiędzy `lo` i `hi` (None = początek / koniec kolumny)."""
+    if lo is None and hi is None:
+        return RANK_STEP
+    if lo is None:
+        return hi - RANK_STEP
+    if hi is None:
+        return lo + RANK_STEP
+    return (lo + hi) / 2
+
+
+def _end_rank(conn: sqlite3.Connection, board_id: int, status: str) -> float:
+    """Ranga za ostatnią kartą kolumny (MAX po indeksie board_id, status, rank)."""
+    last = conn.execute(
+        "SELECT MAX(rank) FROM tasks WHERE board_id = ? AND status = ?", (board_id, status)
+    ).fetchone()[0]
+    return rank_between(last, None)
+
+
+def next_rank(
+    board_id: int, status: str, after: Optional[float], exclude_id: Optional[int] = None
+) -> Optional[float]:
+    """Najmniejsza ranga w kolumnie większa od `after` (None = koniec kolumny).
+
+    Górna granica przy upuszczeniu karty za ostatnią widoczną kartą okna -
+    dalsze karty kolumny nie są wczytane. `exclude_id` to przenoszona karta.
+    """
+    with connection() as conn:
+        return conn.execute(
+            "SELECT MIN(rank) FROM tasks WHERE board_id = ? AND status = ? AND rank > ? AND id != ?",
+            (board_id, status, float("-inf") if after is None else after, exclude_id or 0),
+        ).fetchone()[0]
+
+
+def _rebalance(conn: sqlite3.Connection, board_id: int, status: str) -> None:
+    conn.execute(
+        """WITH ordered AS (
+               SELECT id, ROW_NUMBER() OVER (ORDER BY rank, id) AS position
+               FROM tasks WHERE board_id = ? AND status = ?
+           )
+           UPDATE tasks SET rank = ordered.position * ?
+           FROM ordered WHERE tasks.id = ordered.id""",
+        (board_id, status, RANK_STEP),
+    )
+
+
+@_writes
+def rebalance_ranks(conn: sqlite3.Connection, board_id: int, status: str) -> None:
+    """Przenumerowuje rangi kolumny na równe odstępy (kolejność bez zmian)."""
+    _rebalance(conn, board_id, status)
+
+
+def schedule_rebalance(board_id: int, status: str) -> None:
+    """Zleca przenumerowanie rang kolumny w tle (co najwyżej jedno naraz)."""
+    key = (str(DB_PATH), board_id, status)
+    with _rebalancing_lock:
+        if key in _rebalancing:
+            return
+        _rebalancing.add(key)
+
+    def run() -> None:
+        try:
+            rebalance_ranks(board_id, status)
+        finally:
+            with _rebalancing_lock:
+                _rebalancing.discard(key)
+
+    threading.Thread(target=run, name=f"rebalance-{status}", daemon=True).start()
+
+
+def _move_relative(conn: sqlite3.Connection, task_id: int, anchor_id: int, before: bool) -> bool:
+    anchor = conn.execute(
+        "SELECT board_id, status, rank FROM tasks WHERE id = ?", (anchor_id,)
+    ).fetchone()
+    if anchor is None or anchor_id == task_id:
+        return False
+    board_id, status, anchor_rank = anchor["board_id"], anchor["status"], anchor["rank"]
+
+    def neighbour() -> Optional[float]:
+        column = "board_id = ? AND status = ?"
+        if before:
+            sql = f"SELECT MAX(rank) FROM tasks WHERE {column} AND rank < ? AND id != ?"
+        else:
+            sql = f"SELECT MIN(rank) FROM tasks WHERE {column} AND rank > ? AND id != ?"
+        return conn.execute(sql, (board_id, status, anchor_rank, task_id)).fetchone()[0]
+
+    other = neighbour()
+    lo, hi = (other, anchor_rank) if before else (anchor_rank, other)
+    rank = rank_between(lo, hi)
+    if lo is not None and hi is not None and not lo < rank < hi:
+        # Skończyła się precyzja - przenumeruj kolumnę od razu
+        _rebalance(conn, board_id, status)
+        anchor_rank = conn.execute("SELECT rank FROM tasks WHERE id = ?", (anchor_id,)).fetchone()[0]
+        other = neighbour()
+        lo, hi = (other, anchor_rank) if before else (anchor_rank, other)
+        rank = rank_between(lo, hi)
+
+    # Karta zostaje na swojej tablicy - kotwica z innej tablicy nie przenosi jej
     cursor = conn.execute(
-        """INSERT INTO tasks (title, status, priority, description, deadline, created_at)
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (
-            task.title,
-            task.status,
-            task.priority,
-            task.description,
-            task.deadline.isoformat() if task.deadline else None,
-            task.created_at,
-        ),
+        "UPDATE tasks SET status = ?, rank = ? WHERE id = ? AND board_id = ?",
+        (status, rank, task_id, board_id),
+    )
+
+    if lo is not None and hi is not None and hi - lo < RANK_MIN_GAP:
+        schedule_rebalance(board_id, status)
+    return cursor.rowcount == 1
+
+
+@_writes
+def move_task_before(conn: sqlite3.Connection, task_id: int, anchor_id: int) -> bool:
+    """Stawia zadanie bezpośrednio przed `anchor_id` (także w innej kolumnie).
+
+    Zmienia dokładnie jeden wiersz. Zwraca False, gdy któregoś zadania nie ma
+    albo są na różnych tablicach.
+    """
+    return _move_relative(conn, task_id, anchor_id, before=True)
+
+
+@_writes
+def move_task_after(conn: sqlite3.Connection, task_id: int, anchor_id: int) -> bool:
+    """Stawia zadanie bezpośrednio za `anchor_id` (także w innej kolumnie)."""
+    return _move_relative(conn, task_id, anchor_id, before=False)
+
+
+@_writes
+def set_positions(
+    conn: sqlite3.Connection, board_id: int, positions: dict[int, tuple[str, float]]
+) -> dict[int, bool]:
+    """Ustawia status i rangę wielu zadań tablicy w jednej transakcji.
+
+    `positions` to {id: (status, ranga)}. Zwraca {id: czy zadanie istniało na tablicy}.
+    """
+    existing = _existing_ids(conn, board_id, list(positions))
+    conn.executemany(
+        "UPDATE tasks SET status = ?, rank = ? WHERE id = ?",
+        [
+            (status, rank, task_id)
+            for task_id, (status, rank) in positions.items()
+            if task_id in existing
+        ],
+    )
+    return {task_id: task_id in existing for task_id in positions}
+
+
+@_writes
+def add_task(conn: sqlite3.Connection, task: Task) -> int:
+    cursor = conn.execute(
+        _INSERT_TASK_SQL, (*_task_params(task), _end_rank(conn, task.board_id, task.status))
     )
-    conn.commit()
-    task_id = cursor.lastrowid
-    conn.close()
-    return task_id
+    return cursor.lastrowid
+
+
+@_writes
+def add_tasks(conn: sqlite3.Connection, tasks: list[Task]) -> list[int]:
+    """Dodaje wiele zadań w jednej transakcji. Zwraca ich id (w tej samej kolejności)."""
+    ends: dict[tuple[int, str], float] = {}
+    ids = []
+    for t in tasks:
+        column = (t.board_id, t.status)
+        if column not in ends:
+            ends[column] = _end_rank(conn, *column)
+        ids.append(conn.execute(_INSERT_TASK_SQL, (*_task_params(t), ends[column])).lastrowid)
+        ends[column] += RANK_STEP
+    return ids
 
 
-def update_task_status(task_id: int, new_status: str) -> None:
-    conn = get_connection()
-    conn.execute("UPDATE tasks SET status = ? WHERE id = ?", (new_status, task_id))
-    conn.commit()
-    conn.close()
+@_writes
+def update_task_status(conn: sqlite3.Connection, task_id: int, new_status: str) -> None:
+    """Zmienia status zadania; w nowej kolumnie trafia ono na koniec."""
+    row = conn.execute("SELECT board_id FROM tasks WHERE id = ?", (task_id,)).fetchone()
+    if row is None:
+        return
+    conn.execute(
+        "UPDATE tasks SET status = ?, rank = ? WHERE id = ? AND status != ?",
+        (new_status, _end_rank(conn, row[0], new_status), task_id, new_status),
+    )
 
 
-def update_task(task: Task) -> None:
-    conn = get_connection()
+@_writes
+def update_task(conn: sqlite3.Connection, task: Task) -> None:
     conn.execute(
-        """UPDATE tasks SET title=?, status=?, priority=?, description=?, deadline=?
-           WHERE id=?""",
+        """UPDATE tasks SET title=?, status=?, priority=?, description=?, deadline=?,
+                  rank = CASE WHEN status = ? THEN rank ELSE ? END
+           WHERE id=? AND board_id=?""",
         (
             task.title,
             task.status,
             task.priority,
             task.description,
-            task.deadline.isoformat() if task.deadline else None,
+            task.deadline_iso,
+            task.status,
+            _end_rank(conn, task.board_id, task.status),
             task.id,
+            task.board_id,
         ),
     )
-    conn.commit()
-    conn.close()
 
 
-def delete_task(task_id: int) -> None:
-    conn = get_connection()
+@_writes
+def delete_task(conn: sqlite3.Connection, task_id: int) -> None:
     conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-    conn.commit()
-    conn.close()
+
+
+def _move_params(
+    conn: sqlite3.Connection, board_id: int, moves: list[tuple[int, str]]
+) -> list[tuple]:
+    """Parametry UPDATE dla przeniesień - kolejne rangi na końcu kolumn docelowych."""
+    ends: dict[str, float] = {}
+    params = []
+    for task_id, status in moves:
+        if status not in ends:
+            ends[status] = _end_rank(conn, board_id, status)
+        params.append((status, ends[status], task_id, status))
+        ends[status] += RANK_STEP
+    return params
+
+
+@_writes
+def update_statuses(
+    conn: sqlite3.Connection, board_id: int, task_ids: list[int], new_status: str
+) -> dict[int, bool]:
+    """Zmienia status wielu zadań tablicy w jednej transakcji.
+
+    Zwraca {id: True/False} - False, gdy zadania o danym id nie ma na tablicy.
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    existing = _existing_ids(conn, board_id, task_ids)
+    conn.executemany(
+        "UPDATE tasks SET status = ?, rank = ? WHERE id = ? AND status != ?",
+        _move_params(
+            conn,
+            board_id,
+            [(task_id, new_status) for task_id in task_ids if task_id in existing],
+        ),
+    )
+    return {task_id: task_id in existing for task_id in task_ids}
+
+
+@_writes
+def delete_tasks(
+    conn: sqlite3.Connection, board_id: int, task_ids: list[int]
+) -> dict[int, bool]:
+    """Usuwa wiele zadań tablicy w jednej transakcji. Zwraca {id: czy usunięto}."""
+    task_ids = list(dict.fromkeys(task_ids))
+    existing = _existing_ids(conn, board_id, task_ids)
+    conn.executemany(
+        "DELETE FROM tasks WHERE id = ?",
+        [(task_id,) for task_id in task_ids if task_id in existing],
+    )
+    return {task_id: task_id in existing for task_id in task_ids}
+
+
+# --- Archiwum ----------------------------------------------------------------
+# Zadania ukończone dawniej niż ARCHIVE_AFTER_DAYS dni są partiami przenoszone
+# do tasks_archive. Tablica, liczniki i indeksy obejmują tylko zadania
+# aktywne, więc ich rozmiar nie rośnie razem z historią.
+
+ARCHIVE_AFTER_DAYS = int(os.environ.get("KANBAN_ARCHIVE_DAYS", 30))
+ARCHIVE_BATCH_SIZE = 500
+# Co ile sekund proces sam archiwizuje stare zadania tablicy
+ARCHIVE_INTERVAL = 3600
+
+_ARCHIVE_COLUMNS = _TASK_COLUMNS + ", completed_at"
+
+_archive_runs: dict[tuple[str, int], float] = {}
+_archive_lock = threading.Lock()
+
+
+@_writes
+def archive_batch(
+    conn: sqlite3.Connection, board_id: int, completed_before: str, limit: int = ARCHIVE_BATCH_SIZE
+) -> int:
+    """Przenosi do archiwum do `limit` zadań ukończonych przed `completed_before`."""
+    task_ids = [
+        r[0]
+        for r in conn.execute(
+            "SELECT id FROM tasks WHERE board_id = ? AND completed_at < ? LIMIT ?",
+            (board_id, completed_before, limit),
+        )
+    ]
+    if task_ids:
+        placeholders = ", ".join("?" * len(task_ids))
+        conn.execute(
+            f"INSERT INTO tasks_archive ({_ARCHIVE_COLUMNS}, archived_at) "
+            f"SELECT {_ARCHIVE_COLUMNS}, ? FROM tasks WHERE id IN ({placeholders})",
+            (datetime.now().isoformat(), *task_ids),
+        )
+        conn.execute(f"DELETE FROM tasks WHERE id IN ({placeholders})", task_ids)
+    return len(task_ids)
+
+
+def archive_done_tasks(board_id: int, older_than_days: int = ARCHIVE_AFTER_DAYS) -> int:
+    """Archiwizuje zadania ukończone ponad `older_than_days` dni temu. Zwraca ich liczbę.
+
+    Każda partia to osobna transakcja - inne zapisy nie czekają na całość.
+    """
+    cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+    total = 0
+    while True:
+        moved = archive_batch(board_id, cutoff)
+        total += moved
+        if moved < ARCHIVE_BATCH_SIZE:
+            return total
+
+
+def schedule_archive(board_id: int) -> None:
+    """Zleca archiwizację starych zadań tablicy w tle (co najwyżej raz na ARCHIVE_INTERVAL)."""
+    key = (str(DB_PATH), board_id)
+    now = time.monotonic()
+    with _archive_lock:
+        last = _archive_runs.get(key)
+        if last is not None and now - last < ARCHIVE_INTERVAL:
+            return
+        _archive_runs[key] = now
+
+    threading.Thread(
+        target=archive_done_tasks, args=(board_id,), name=f"archive-{board_id}", daemon=True
+    ).start()
+
+
+@_writes
+def restore_tasks(
+    conn: sqlite3.Connection, board_id: int, task_ids: list[int]
+) -> dict[int, bool]:
+    """Przywraca zadania z archiwum na koniec kolumny Done. Zwraca {id: czy przywrócono}.
+
+    Data ukończenia jest odświeżana, żeby zadanie nie wróciło od razu do archiwum.
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    archived = set()
+    for i in range(0, len(task_ids), _ID_CHUNK):
+        chunk = task_ids[i:i + _ID_CHUNK]
+        rows = conn.execute(
+            f"SELECT id FROM tasks_archive WHERE board_id = ? AND id IN ({', '.join('?' * len(chunk))})",
+            (board_id, *chunk),
+        )
+        archived.update(r[0] for r in rows)
+
+    rank = _end_rank(conn, board_id, "Done")
+    now = datetime.now().isoformat()
+    params = []
+    for task_id in task_ids:
+        if task_id in archived:
+            params.append((rank, now, task_id))
+            rank += RANK_STEP
+    conn.executemany(
+        f"""INSERT INTO tasks ({_ARCHIVE_COLUMNS})
+            SELECT id, title, status, priority, description, deadline, created_at, ?, board_id, ?
+            FROM tasks_archive WHERE id = ?""",
+        params,
+    )
+    conn.executemany("DELETE FROM tasks_archive WHERE id = ?", [(p[2],) for p in params])
+    return {task_id: task_id in archived for task_id in task_ids}
+
+
+@_cached
+def count_archived(board_id: int) -> int:
+    with connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM tasks_archive WHERE board_id = ?", (board_id,)
+        ).fetchone()[0]
+
+
+@_cached
+def get_archived_tasks(board_id: int, limit: int = 50) -> list[Task]:
+    """Ostatnio zarchiwizowane zadania tablicy (najnowsze id pierwsze)."""
+    with connection() as conn:
+        return _fetch_tasks(
+            conn,
+            f"SELECT {_TASK_COLUMNS} FROM tasks_archive WHERE board_id = ? ORDER BY id DESC LIMIT ?",
+            (board_id, limit),
+        )
+
+
+# --- Metryki przepływu ----------------------------------------------------------
+# Czytane wyłącznie z dziennych agregatów (flow_daily, cycle_time_daily),
+# które triggery utrzymują przy każdym przejściu między statusami.
+
+# Ile ostatnich dni pokazują wykresy przepływu
+FLOW_WINDOW_DAYS = 30
+
+
+@_cached
+def get_flow(board_id: int, today: date, days: int = FLOW_WINDOW_DAYS) -> dict:
+    """Skumulowany przepływ: liczba zadań w każdym statusie na koniec każdego dnia okna.
+
+    Zwraca {"days": [data ISO, ...], "wip": {status: [liczba, ...]},
+    "throughput": [ukończone danego dnia, ...]} - ukończenie to przejście do
+    Done z innej kolumny, nie dodanie zadania od razu jako Done.
+    """
+    start = today - timedelta(days=days - 1)
+    day_list = [(start + timedelta(days=n)).isoformat() for n in range(days)]
+    wip = dict.fromkeys(STATUSES, 0)
+    changes: dict[str, list[tuple[str, int, int]]] = {}
+    with connection() as conn:
+        # Stan na początek okna - suma agregatów sprzed okna
+        for status, total in conn.execute(
+            "SELECT status, SUM(arrivals - departures) FROM flow_daily "
+            "WHERE board_id = ? AND day < ? GROUP BY status",
+            (board_id, day_list[0]),
+        ):
+            if status in wip:
+                wip[status] = total
+        for day, status, arrivals, departures, completed in conn.execute(
+            "SELECT day, status, arrivals, departures, completed FROM flow_daily "
+            "WHERE board_id = ? AND day >= ? AND day <= ?",
+            (board_id, day_list[0], day_list[-1]),
+        ):
+            changes.setdefault(day, []).append((status, arrivals, departures, completed))
+
+    series = {status: [] for status in STATUSES}
+    throughput = []
+    for day in day_list:
+        done = 0
+        for status, arrivals, departures, completed in changes.get(day, ()):
+            if status in wip:
+                wip[status] += arrivals - departures
+            if status == "Done":
+                done = completed
+        for status in STATUSES:
+            series[status].append(wip[status])
+        throughput.append(done)
+    return {"days": day_list, "wip": series, "throughput": throughput}
+
+
+@_cached
+def get_cycle_times(board_id: int, today: date, days: int = FLOW_WINDOW_DAYS) -> list[int]:
+    """Histogram czasu cyklu zadań ukończonych w oknie (przedziały CYCLE_TIME_BUCKETS)."""
+    start = today - timedelta(days=days - 1)
+    counts = [0] * (len(CYCLE_TIME_BUCKETS) + 1)
+    with connection() as conn:
+        for bucket, total in conn.execute(
+            "SELECT bucket, SUM(total) FROM cycle_time_daily "
+            "WHERE board_id = ? AND day >= ? GROUP BY bucket",
+            (board_id, start.isoformat()),
+        ):
+            counts[bucket] = total
+    return counts
+
+
+# --- Import / eksport --------------------------------------------------------
+
+EXPORT_COLUMNS = ("id", "title", "status", "priority", "description", "deadline", "created_at")
+IMPORT_CHUNK_SIZE = 1000
+
+
+def iter_task_rows(board_id: int, batch_size: int = 1000) -> Iterator[sqlite3.Row]:
+    """Strumieniuje wiersze zadań tablicy partiami (stałe zużycie pamięci)."""
+    with connection() as conn:
+        cursor = conn.execute(
+            f"SELECT {', '.join(EXPORT_COLUMNS)} FROM tasks WHERE board_id = ? ORDER BY id",
+            (board_id,),
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+
+def export_csv(board_id: int, fp: TextIO) -> int:
+    """Zapisuje wszystkie zadania tablicy jako CSV do `fp`. Zwraca liczbę wierszy."""
+    writer = csv.writer(fp)
+    writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    for row in iter_task_rows(board_id):
+        writer.writerow(tuple(row))
+        count += 1
+    return count
+
+
+def export_ndjson(board_id: int, fp: TextIO) -> int:
+    """Zapisuje wszystkie zadania tablicy jako NDJSON (jeden obiekt JSON na linię)."""
+    count = 0
+    for row in iter_task_rows(board_id):
+        fp.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False))
+        fp.write("\n")
+        count += 1
+    return count
+
+
+def _text_field(record: dict, name: str) -> Optional[str]:
+    """Pole tekstowe rekordu (None, gdy brak). Rzuca ValueError dla innych typów."""
+    value = record.get(name)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"pole {name} musi być tekstem")
+    return value
+
+
+def _record_to_task(record: dict, board_id: int) -> Task:
+    """Waliduje rekord importu i zamienia go na Task. Rzuca ValueError."""
+    if not isinstance(record, dict):
+        raise ValueError("niepoprawny rekord")
+
+    title = (_text_field(record, "title") or "").strip()
+    if not title:
+        raise ValueError("brak tytułu")
+
+    status = record.get("status") or "To Do"
+    if status not in STATUSES:
+        raise ValueError(f"nieznany status: {status!r}")
+
+    priority = record.get("priority") or "Średni"
+    if priority not in PRIORITIES:
+        raise ValueError(f"nieznany priorytet: {priority!r}")
+
+    deadline = _text_field(record, "deadline") or None
+    if deadline is not None:
+        deadline = date.fromisoformat(deadline)
+
+    created_at = _text_field(record, "created_at") or None
+    if created_at is None:
+        created_at = datetime.now().isoformat()
+    else:
+        try:
+            created_at = datetime.fromisoformat(created_at).isoformat()
+        except ValueError:
+            raise ValueError(f"niepoprawna data utworzenia: {created_at!r}") from None
+
+    return Task(
+        title=title,
+        status=status,
+        priority=priority,
+        description=_text_field(record, "description") or "",
+        deadline=deadline,
+        created_at=created_at,
+        board_id=board_id,
+    )
+
+
+def import_records(
+    board_id: int, records: Iterable[tuple[int, dict]], chunk_size: int = IMPORT_CHUNK_SIZE
+) -> tuple[int, list[str]]:
+    """Importuje rekordy do tablicy partiami - każda partia to jedna transakcja.
+
+    `records` to pary (numer linii w pliku, rekord). Id z pliku są pomijane
+    (zadania dostają nowe id). Zwraca (liczba zaimportowanych, lista błędów
+    walidacji w postaci "wiersz N: ...").
+    """
+    imported = 0
+    errors: list[str] = []
+    chunk: list[Task] = []
+    for line_no, record in records:
+        try:
+            chunk.append(_record_to_task(record, board_id))
+        except (ValueError, TypeError) as exc:
+            errors.append(f"wiersz {line_no}: {exc}")
+            continue
+        if len(chunk) >= chunk_size:
+            imported += len(add_tasks(chunk))
+            chunk = []
+    if chunk:
+        imported += len(add_tasks(chunk))
+    return imported, errors
+
+
+def import_csv(
+    board_id: int, fp: TextIO, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> tuple[int, list[str]]:
+    """Importuje zadania z CSV (nagłówek jak w export_csv).
+
+    Błędy odczytu pliku (UnicodeDecodeError, csv.Error) przerywają import -
+    partie zapisane wcześniej zostają w bazie.
+    """
+    reader = csv.DictReader(fp)
+    # line_num to numer linii pliku, na której kończy się rekord (z nagłówkiem)
+    return import_records(board_id, ((reader.line_num, row) for row in reader), chunk_size)
+
+
+def import_ndjson(
+    board_id: int, fp: TextIO, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> tuple[int, list[str]]:
+    """Importuje zadania z NDJSON (jeden obiekt JSON na linię).
+
+    Błąd dekodowania pliku (UnicodeDecodeError) przerywa import - partie
+    zapisane wcześniej zostają w bazie.
+    """
+    def records() -> Iterator[tuple[int, dict]]:
+        for line_no, line in enumerate(fp, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError:
+                # Niepoprawna linia trafi do listy błędów w import_records
+                yield line_no, line
+
+    return import_records(board_id, records(), chunk_size)
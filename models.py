@@ -1,5 +1,4 @@
-from dataclasses import dataclass, field
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import Optional
 
 
@@ -7,24 +6,136 @@ STATUSES = ["To Do", "In Progress", "Done"]
 PRIORITIES = ["Niski", "Średni", "Wysoki"]
 PRIORITY_COLORS = {"Niski": "#4CAF50", "Średni": "#FF9800", "Wysoki": "#F44336"}
 PRIORITY_ICONS = {"Niski": "🟢", "Średni": "🟡", "Wysoki": "🔴"}
+# Tablica tworzona przy inicjalizacji bazy (do niej trafiają zadania sprzed podziału na tablice)
+DEFAULT_BOARD_ID = 1
+# Szybkie filtry terminów: po terminie, na dziś, w ciągu DUE_SOON_DAYS dni
+DEADLINE_FILTERS = ("overdue", "today", "soon")
+DUE_SOON_DAYS = 7
+
+# Kanoniczne instancje statusów i priorytetów - wiersze z bazy współdzielą
+# te same obiekty str zamiast trzymać własne kopie
+_INTERNED = {v: v for v in (*STATUSES, *PRIORITIES)}
+
+
+def deadline_bounds(kind: str, today: date) -> tuple[Optional[date], date]:
+    """Zakres terminów [od, do) szybkiego filtra `kind` (od = None: bez dolnej granicy)."""
+    if kind == "overdue":
+        return None, today
+    if kind == "today":
+        return today, today + timedelta(days=1)
+    if kind == "soon":
+        return today, today + timedelta(days=DUE_SOON_DAYS + 1)
+    raise ValueError(f"nieznany filtr terminu: {kind!r}")
 
 
-@dataclass
 class Task:
-    id: int = 0
-    title: str = ""
-    status: str = "To Do"
-    priority: str = "Średni"
-    description: str = ""
-    deadline: Optional[date] = None
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    """Zadanie na tablicy.
+
+    Klasa z __slots__ (bez __dict__ per instancja). Termin może zostać
+    przekazany jako tekst ISO prosto z bazy - jest parsowany leniwie,
+    przy pierwszym odczycie `deadline`.
+    """
+
+    __slots__ = (
+        "id", "title", "status", "priority", "description", "_deadline", "created_at", "rank",
+        "board_id",
+    )
+
+    def __init__(
+        self,
+        id: int = 0,
+        title: str = "",
+        status: str = "To Do",
+        priority: str = "Średni",
+        description: str = "",
+        deadline: Optional[date | str] = None,
+        created_at: Optional[str] = None,
+        rank: float = 0.0,
+        board_id: int = DEFAULT_BOARD_ID,
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.status = _INTERNED.get(status, status)
+        self.priority = _INTERNED.get(priority, priority)
+        self.description = description
+        self._deadline = deadline
+        self.created_at = created_at if created_at is not None else datetime.now().isoformat()
+        # Pozycja w kolumnie (ranga ułamkowa, nadawana przez bazę)
+        self.rank = rank
+        self.board_id = board_id
+
+    @property
+    def deadline(self) -> Optional[date]:
+        deadline = self._deadline
+        if deadline.__class__ is str:
+            deadline = self._deadline = date.fromisoformat(deadline)
+        return deadline
+
+    @deadline.setter
+    def deadline(self, value: Optional[date | str]) -> None:
+        self._deadline = value
 
     @property
-    def is_overdue(self) -> bool:
-        if self.deadline and self.status != "Done":
-            return self.deadline < date.today()
+    def deadline_iso(self) -> Optional[str]:
+        """Termin jako tekst ISO (bez parsowania, jeśli przyszedł z bazy)."""
+        deadline = self._deadline
+        if deadline is None or deadline.__class__ is str:
+            return deadline
+        return deadline.isoformat()
+
+    def replace(self, **changes) -> "Task":
+        """Zwraca kopię zadania ze zmienionymi polami."""
+        fields = {
+            "id": self.id,
+            "title": self.title,
+            "status": self.status,
+            "priority": self.priority,
+            "description": self.description,
+            "deadline": self._deadline,
+            "created_at": self.created_at,
+            "rank": self.rank,
+            "board_id": self.board_id,
+        }
+        fields.update(changes)
+        return Task(**fields)
+
+    def _key(self) -> tuple:
+        return (
+            self.id, self.title, self.status, self.priority,
+            self.description, self.deadline, self.created_at, self.rank, self.board_id,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not Task:
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Task(id={self.id!r}, title={self.title!r}, status={self.status!r}, "
+            f"priority={self.priority!r}, description={self.description!r}, "
+            f"deadline={self.deadline!r}, created_at={self.created_at!r}, rank={self.rank!r}, "
+            f"board_id={self.board_id!r})"
+        )
+
+    def is_overdue(self, today: Optional[date] = None) -> bool:
+        """Czy niezakończone zadanie jest po terminie.
+
+        `today` liczone raz na rerun przez wywołującego - bez date.today() per zadanie.
+        """
+        if self._deadline is not None and self.status != "Done":
+            return self.deadline < (today or date.today())
         return False
 
+    def is_due_within(self, start: Optional[date], end: date) -> bool:
+        """Czy niezakończone zadanie ma termin w zakresie [start, end)."""
+        if self._deadline is None or self.status == "Done":
+            return False
+        deadline = self.deadline
+        return deadline < end and (start is None or deadline >= start)
+
     @property
     def priority_icon(self) -> str:
         return PRIORITY_ICONS.get(self.priority, "⚪")
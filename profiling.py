@@ -0,0 +1,203 @@
+"""Opcjonalne profilowanie reruna aplikacji.
+
+Włączane zmienną środowiskową KANBAN_PROFILE=1. Mierzy czasy faz
+(`span`) oraz liczbę i czas zapytań SQL (połączenia z database.py są
+wtedy tworzone z instrumentowaną klasą). Wyłączone nie kosztuje nic:
+połączenia są zwykłe, a `span` od razu oddaje sterowanie.
+
+Rerany logowane jako JSON (jeden obiekt na linię) trafiają na stderr albo
+do pliku wskazanego w KANBAN_PROFILE_LOG.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+ENABLED = os.environ.get("KANBAN_PROFILE", "") not in ("", "0")
+HISTORY_SIZE = 200
+SLOW_QUERIES = 5
+
+logger = logging.getLogger("kanban.profile")
+
+
+def _configure_logger() -> None:
+    """Własny handler loggera - Streamlit konfiguruje tylko loggery streamlit.*."""
+    if logger.handlers:
+        return
+    path = os.environ.get("KANBAN_PROFILE_LOG")
+    handler = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    # Bez przekazywania do roota - inaczej przy skonfigurowanym roocie linie by się dublowały
+    logger.propagate = False
+
+
+if ENABLED:
+    _configure_logger()
+
+_local = threading.local()
+_history: deque = deque(maxlen=HISTORY_SIZE)
+_history_lock = threading.Lock()
+
+
+class _Run:
+    __slots__ = ("started", "spans", "stack", "queries", "sql_ms", "fetch_ms", "slowest")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.spans: dict[str, float] = {}
+        self.stack: list[str] = []
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.fetch_ms = 0.0
+        self.slowest: list[tuple[float, str]] = []
+
+
+def _current() -> Optional[_Run]:
+    return getattr(_local, "run", None)
+
+
+def begin_run() -> None:
+    """Rozpoczyna pomiar reruna w bieżącym wątku."""
+    if ENABLED:
+        _local.run = _Run()
+
+
+def end_run(log: bool = False) -> Optional[dict]:
+    """Kończy pomiar, dopisuje go do historii i opcjonalnie loguje jako JSON."""
+    run = _current()
+    if run is None:
+        return None
+    _local.run = None
+
+    record = {
+        "total_ms": (time.perf_counter() - run.started) * 1000,
+        "spans": run.spans,
+        "queries": run.queries,
+        "sql_ms": run.sql_ms,
+        "fetch_ms": run.fetch_ms,
+        "slowest": [{"ms": ms, "sql": sql} for ms, sql in sorted(run.slowest, reverse=True)],
+    }
+    with _history_lock:
+        _history.append(record)
+    if log:
+        logger.info(json.dumps(record, ensure_ascii=False))
+    return record
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Mierzy czas fazy. Zagnieżdżone spany dostają nazwy "rodzic.dziecko"."""
+    run = _current()
+    if run is None:
+        yield
+        return
+    run.stack.append(name)
+    path = ".".join(run.stack)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run.spans[path] = run.spans.get(path, 0.0) + (time.perf_counter() - start) * 1000
+        run.stack.pop()
+
+
+def _record_query(sql: str, ms: float) -> None:
+    run = _current()
+    if run is None:
+        return
+    run.queries += 1
+    run.sql_ms += ms
+    slowest = run.slowest
+    if len(slowest) < SLOW_QUERIES:
+        slowest.append((ms, sql))
+    elif ms > min(slowest)[0]:
+        slowest.remove(min(slowest))
+        slowest.append((ms, sql))
+
+
+def _record_fetch(ms: float) -> None:
+    run = _current()
+    if run is not None:
+        run.fetch_ms += ms
+
+
+def history() -> list[dict]:
+    with _history_lock:
+        return list(_history)
+
+
+def percentiles(q: tuple[int, ...] = (50, 95)) -> dict[str, dict[int, float]]:
+    """Kroczące percentyle czasu każdego spanu (i całego reruna) z historii."""
+    samples: dict[str, list[float]] = {}
+    for record in history():
+        samples.setdefault("total", []).append(record["total_ms"])
+        samples.setdefault("sql", []).append(record["sql_ms"])
+        for name, ms in record["spans"].items():
+            samples.setdefault(name, []).append(ms)
+
+    result = {}
+    for name, values in samples.items():
+        values.sort()
+        result[name] = {p: values[min(len(values) - 1, len(values) * p // 100)] for p in q}
+    return result
+
+
+# --- Instrumentowane połączenie SQLite ---------------------------------------
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Kursor mierzący czas execute (SQLite) i fetch (kroki + dekodowanie wierszy)."""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _record_query(sql, (time.perf_counter() - start) * 1000)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _record_query(sql, (time.perf_counter() - start) * 1000)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            _record_fetch((time.perf_counter() - start) * 1000)
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(size) if size is not None else super().fetchmany()
+        finally:
+            _record_fetch((time.perf_counter() - start) * 1000)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            _record_fetch((time.perf_counter() - start) * 1000)
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Połączenie, którego wszystkie kursory są ProfiledCursor."""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,139 @@
+from datetime import date
+from typing import Iterable, Optional
+
+import numpy as np
+
+from models import Task, STATUSES, PRIORITIES, deadline_bounds
+
+
+STATUS_CODES = {s: i for i, s in enumerate(STATUSES)}
+PRIORITY_CODES = {p: i for i, p in enumerate(PRIORITIES)}
+DONE_CODE = STATUS_CODES["Done"]
+# Zadanie bez terminu nigdy nie jest po terminie
+NO_DEADLINE = np.iinfo(np.int32).max
+
+
+class TaskTable:
+    """Kolumnowy widok zadań: id, kody statusu/priorytetu i terminy jako ordinale.
+
+    Pozwala liczyć filtry, zadania po terminie i liczniki grup wektorowo,
+    bez tworzenia obiektów Task dla każdego wiersza.
+    """
+
+    __slots__ = ("ids", "status", "priority", "deadline")
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        status: np.ndarray,
+        priority: np.ndarray,
+        deadline: np.ndarray,
+    ) -> None:
+        self.ids = ids
+        self.status = status
+        self.priority = priority
+        self.deadline = deadline
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple], count: int = -1) -> "TaskTable":
+        """Buduje tabelę z krotek (id, status_code, priority_code, deadline_ordinal)."""
+        flat = np.fromiter(
+            (value for row in rows for value in row),
+            dtype=np.int64,
+            count=count * 4 if count >= 0 else -1,
+        )
+        data = flat.reshape(-1, 4)
+        return cls(
+            data[:, 0].copy(),
+            data[:, 1].astype(np.int8),
+            data[:, 2].astype(np.int8),
+            data[:, 3].astype(np.int32),
+        )
+
+    @classmethod
+    def from_tasks(cls, tasks: list[Task]) -> "TaskTable":
+        return cls.from_rows(
+            (
+                (
+                    t.id,
+                    STATUS_CODES.get(t.status, -1),
+                    PRIORITY_CODES.get(t.priority, -1),
+                    t.deadline.toordinal() if t.deadline else NO_DEADLINE,
+                )
+                for t in tasks
+            ),
+            count=len(tasks),
+        )
+
+    def apply_changes(self, changed: list[Task], deleted: Iterable[int] = ()) -> "TaskTable":
+        """Nowa tabela z podmienionymi/dodanymi zadaniami `changed` i bez `deleted`.
+
+        Koszt zależy od rozmiaru tabeli tylko przez kopię tablic - bez
+        ponownego czytania wierszy z bazy. Kolejność id zostaje rosnąca.
+        """
+        update = TaskTable.from_tasks(changed)
+        drop = np.concatenate([update.ids, np.fromiter(deleted, dtype=np.int64)])
+        keep = ~np.isin(self.ids, drop)
+        ids = np.concatenate([self.ids[keep], update.ids])
+        order = np.argsort(ids, kind="stable")
+        return TaskTable(
+            ids[order],
+            np.concatenate([self.status[keep], update.status])[order],
+            np.concatenate([self.priority[keep], update.priority])[order],
+            np.concatenate([self.deadline[keep], update.deadline])[order],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def filter_mask(self, filters: dict, matching_ids: Optional[Iterable[int]] = None) -> np.ndarray:
+        """Maska zadań spełniających filtry z sidebara.
+
+        `matching_ids` to wynik wyszukiwania pełnotekstowego (None = bez wyszukiwania).
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        if matching_ids is not None:
+            mask &= np.isin(self.ids, np.fromiter(matching_ids, dtype=np.int64))
+
+        if filters.get("priority"):
+            codes = [PRIORITY_CODES[p] for p in filters["priority"] if p in PRIORITY_CODES]
+            mask &= np.isin(self.priority, codes)
+
+        if filters.get("hide_done"):
+            mask &= self.status != DONE_CODE
+
+        if filters.get("deadline"):
+            start, end = deadline_bounds(filters["deadline"], filters.get("today") or date.today())
+            mask &= (self.deadline < end.toordinal()) & (self.status != DONE_CODE)
+            if start is not None:
+                mask &= self.deadline >= start.toordinal()
+
+        return mask
+
+    def overdue_mask(self, today: Optional[date] = None) -> np.ndarray:
+        """Maska niezakończonych zadań z terminem przed `today` (jedno date.today())."""
+        today = today or date.today()
+        return (self.deadline < today.toordinal()) & (self.status != DONE_CODE)
+
+    def status_counts(self, mask: Optional[np.ndarray] = None) -> dict[str, int]:
+        """Liczba zadań per status (opcjonalnie tylko w obrębie maski)."""
+        status = self.status if mask is None else self.status[mask]
+        counts = np.bincount(status[status >= 0], minlength=len(STATUSES))
+        return {s: int(counts[i]) for i, s in enumerate(STATUSES)}
+
+    def ids_by_status(self, ids: Iterable[int]) -> dict[str, np.ndarray]:
+        """Id z `ids` obecne w tabeli, pogrupowane po statusie."""
+        found = np.isin(self.ids, np.fromiter(ids, dtype=np.int64))
+        return {s: self.ids[found & (self.status == code)] for s, code in STATUS_CODES.items()}
+
+    def stats(self, today: Optional[date] = None) -> dict:
+        """Statystyki w tym samym formacie co db.get_stats()."""
+        by_status = self.status_counts()
+        return {
+            "total": len(self),
+            "by_status": by_status,
+            "done": by_status["Done"],
+            "in_progress": by_status["In Progress"],
+            "overdue": int(self.overdue_mask(today).sum()),
+        }
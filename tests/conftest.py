@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Moduły aplikacji leżą w katalogu głównym repozytorium
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import database as db  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Pusta baza w katalogu tymczasowym; połączenia i wątki zapisu zamykane po teście."""
+    path = tmp_path / "kanban.db"
+    monkeypatch.setattr(db, "DB_PATH", path)
+    yield path
+    db.close_connections()
@@ -0,0 +1,184 @@
+import io
+import sqlite3
+from datetime import date
+
+import pytest
+
+import database as db
+from components import board
+from models import Task, STATUSES, DEFAULT_BOARD_ID
+
+
+def _connect(path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _user_version(path) -> int:
+    conn = _connect(path)
+    try:
+        return db._user_version(conn)
+    finally:
+        conn.close()
+
+
+def _assert_consistent(board_id: int) -> None:
+    """Liczniki task_counts zgodne z tabelą tasks, indeks FTS zgodny z treścią."""
+    conn = _connect(db.DB_PATH)
+    try:
+        actual = dict.fromkeys(STATUSES, 0)
+        actual.update(conn.execute(
+            "SELECT status, COUNT(*) FROM tasks WHERE board_id = ? GROUP BY status", (board_id,)
+        ).fetchall())
+        # Z rank = 1 integrity-check porównuje indeks także z tabelą treści
+        conn.execute("INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('integrity-check', 1)")
+        conn.rollback()
+    finally:
+        conn.close()
+    assert db.get_stats(board_id)["by_status"] == actual
+
+
+def test_migrates_baseline_schema(db_path):
+    # Schemat sprzed wersjonowania: bez tablic i rang, kolumna category zamiast description
+    with _connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'To Do',
+                priority TEXT NOT NULL DEFAULT 'Średni',
+                category TEXT DEFAULT '',
+                deadline TEXT,
+                created_at TEXT NOT NULL
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO tasks (title, status, category, created_at) VALUES (?, ?, ?, ?)",
+            [
+                ("Faktura za hosting", "To Do", "opłacić do piątku", "2026-01-01T10:00:00"),
+                ("Przegląd kodu", "Done", "", "2026-01-02T10:00:00"),
+            ],
+        )
+    conn.close()
+
+    db.init_db()
+
+    assert _user_version(db_path) == db.SCHEMA_VERSION
+    tasks = db.get_all_tasks(DEFAULT_BOARD_ID)
+    assert [(t.title, t.description, t.rank) for t in tasks] == [
+        ("Faktura za hosting", "opłacić do piątku", 1.0),
+        ("Przegląd kodu", "", 2.0),
+    ]
+    assert db.search_task_ids(DEFAULT_BOARD_ID, "piątk") == [tasks[0].id]
+    _assert_consistent(DEFAULT_BOARD_ID)
+
+
+@pytest.mark.parametrize("version", range(2, db.SCHEMA_VERSION))
+def test_migrates_earlier_schema(db_path, version):
+    # Baza zatrzymana po `version` krokach, z zadaniami dodanymi w tym stanie
+    with _connect(db_path) as conn:
+        for number, step in enumerate(db.MIGRATIONS[:version], 1):
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+        conn.executemany(
+            "INSERT INTO tasks (title, status, created_at) VALUES (?, ?, ?)",
+            [("Spotkanie zespołu", "To Do", "2026-01-01T10:00:00"),
+             ("Migracja bazy", "In Progress", "2026-01-02T10:00:00")],
+        )
+    conn.close()
+
+    db.init_db()
+
+    assert _user_version(db_path) == db.SCHEMA_VERSION
+    assert len(db.search_task_ids(DEFAULT_BOARD_ID, "migr")) == 1
+    _assert_consistent(DEFAULT_BOARD_ID)
+
+    # Kolejne wywołanie niczego już nie zmienia
+    db.init_db()
+    assert _user_version(db_path) == db.SCHEMA_VERSION
+
+
+def test_archive_and_restore_keep_counters_and_search(db_path):
+    db.init_db()
+    ids = db.add_tasks([
+        Task(title="Faktura styczeń", status="Done"),
+        Task(title="Faktura luty", status="Done"),
+        Task(title="Faktura marzec", status="In Progress"),
+        Task(title="Raport", status="To Do"),
+    ])
+    _assert_consistent(DEFAULT_BOARD_ID)
+
+    # Ujemny wiek: archiwizowane są wszystkie ukończone zadania
+    assert db.archive_done_tasks(DEFAULT_BOARD_ID, older_than_days=-1) == 2
+    assert db.count_archived(DEFAULT_BOARD_ID) == 2
+    assert db.search_task_ids(DEFAULT_BOARD_ID, "faktura", ranked=False) == [ids[2]]
+    _assert_consistent(DEFAULT_BOARD_ID)
+
+    assert db.restore_tasks(DEFAULT_BOARD_ID, ids[:2]) == {ids[0]: True, ids[1]: True}
+    assert db.count_archived(DEFAULT_BOARD_ID) == 0
+    assert sorted(db.search_task_ids(DEFAULT_BOARD_ID, "faktura")) == ids[:3]
+    assert db.get_stats(DEFAULT_BOARD_ID)["by_status"]["Done"] == 2
+    _assert_consistent(DEFAULT_BOARD_ID)
+
+
+def test_diff_layout_keeps_card_inside_column_window(db_path):
+    db.init_db()
+    ids = db.add_tasks([Task(title=f"Karta {i}") for i in range(30)])
+    page_size = 20
+    columns = {
+        status: db.get_tasks_page(DEFAULT_BOARD_ID, {}, status, limit=page_size)[0]
+        for status in STATUSES
+    }
+    index = {t.id: t for tasks in columns.values() for t in tasks}
+
+    # Pierwsza karta przeciągnięta na koniec okna - za nim jest jeszcze 10 kart
+    containers = board._build_sortable_items(columns, None)
+    items = list(containers[0]["items"])
+    items.append(items.pop(0))
+    containers[0] = dict(containers[0], items=items)
+    has_more = {status: status == "To Do" for status in STATUSES}
+
+    positions = board._diff_layout(containers, index, has_more)
+
+    assert list(positions) == [ids[0]]
+    status, rank = positions[ids[0]]
+    assert status == "To Do"
+    assert index[ids[page_size - 1]].rank < rank < db.get_all_tasks(DEFAULT_BOARD_ID)[page_size].rank
+
+    db.set_positions(DEFAULT_BOARD_ID, positions)
+    order = [t.id for t in db.get_tasks_page(DEFAULT_BOARD_ID, {}, "To Do")[0]]
+    assert order == ids[1:page_size] + [ids[0]] + ids[page_size:]
+
+
+def test_close_connections_drops_read_cache(db_path):
+    db.init_db()
+    assert db.get_all_tasks(DEFAULT_BOARD_ID) == []
+    db.close_connections()
+
+    # Zapis spoza aplikacji; licznik data_version nowego obserwatora zaczyna od nowa
+    with _connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO tasks (title, created_at) VALUES ('Z zewnątrz', '2026-01-01T10:00:00')"
+        )
+    conn.close()
+
+    assert [t.title for t in db.get_all_tasks(DEFAULT_BOARD_ID)] == ["Z zewnątrz"]
+
+
+def test_throughput_counts_only_transitions_to_done(db_path):
+    db.init_db()
+    fp = io.StringIO(
+        '{"title": "Zrobione wcześniej", "status": "Done"}\n'
+        '{"title": "Też zrobione", "status": "Done"}\n'
+        '{"title": "Do zrobienia"}\n'
+    )
+    assert db.import_ndjson(DEFAULT_BOARD_ID, fp) == (3, [])
+    today = date.today()
+    assert db.get_flow(DEFAULT_BOARD_ID, today)["throughput"][-1] == 0
+
+    todo = db.get_tasks_by_status(DEFAULT_BOARD_ID, "To Do")[0]
+    db.update_task_status(todo.id, "Done")
+    flow = db.get_flow(DEFAULT_BOARD_ID, today)
+    assert flow["throughput"][-1] == 1
+    assert flow["wip"]["Done"][-1] == 3
@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+import database as db
+from models import DEFAULT_BOARD_ID
+
+
+@pytest.fixture(autouse=True)
+def board_db(db_path):
+    db.init_db()
+
+
+def _titles() -> list[str]:
+    return [t.title for t in db.get_all_tasks(DEFAULT_BOARD_ID)]
+
+
+def test_ndjson_reports_file_lines_and_skips_blank_lines():
+    fp = io.StringIO(
+        '{"title": "Pierwsze"}\n'
+        "\n"
+        '{"title": 42}\n'
+        "   \n"
+        "to nie jest JSON\n"
+        '{"title": "Drugie", "description": ["lista"]}\n'
+        '{"title": "Trzecie", "created_at": "garbage"}\n'
+        '{"title": "Czwarte", "created_at": "2026-01-02T10:30:00"}\n'
+    )
+
+    imported, errors = db.import_ndjson(DEFAULT_BOARD_ID, fp)
+
+    assert imported == 2
+    assert [error.split(":")[0] for error in errors] == [
+        "wiersz 3", "wiersz 5", "wiersz 6", "wiersz 7",
+    ]
+    assert "pole title musi być tekstem" in errors[0]
+    assert "pole description musi być tekstem" in errors[2]
+    assert "niepoprawna data utworzenia" in errors[3]
+    assert _titles() == ["Pierwsze", "Czwarte"]
+    assert db.get_all_tasks(DEFAULT_BOARD_ID)[1].created_at == "2026-01-02T10:30:00"
+
+
+def test_csv_reports_line_of_record_end():
+    fp = io.StringIO(
+        "title,status,description,created_at\n"
+        "Pierwsze,To Do,,\n"
+        '"Wieloliniowe",Done,"linia 1\nlinia 2",\n'
+        "Złe,Nieznany,,\n"
+        "Zła data,To Do,,wczoraj\n"
+    )
+
+    imported, errors = db.import_csv(DEFAULT_BOARD_ID, fp)
+
+    assert imported == 2
+    # Opis w cudzysłowie zajmuje dwie linie pliku - kolejne numery są przesunięte
+    assert errors == [
+        "wiersz 5: nieznany status: 'Nieznany'",
+        "wiersz 6: niepoprawna data utworzenia: 'wczoraj'",
+    ]
+    assert _titles() == ["Pierwsze", "Wieloliniowe"]
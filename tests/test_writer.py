@@ -0,0 +1,110 @@
+import sqlite3
+import sys
+import threading
+from concurrent.futures import wait
+
+import pytest
+
+from writer import Writer
+
+
+@pytest.fixture
+def connect(tmp_path):
+    path = tmp_path / "writer.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE items (value INTEGER NOT NULL)")
+    conn.close()
+    return lambda: sqlite3.connect(path, check_same_thread=False)
+
+
+def _insert(conn: sqlite3.Connection, value: int) -> int:
+    return conn.execute("INSERT INTO items (value) VALUES (?)", (value,)).lastrowid
+
+
+def _fail(conn: sqlite3.Connection) -> None:
+    _insert(conn, -1)
+    raise ValueError("błąd operacji")
+
+
+def _values(connect) -> list[int]:
+    conn = connect()
+    try:
+        return [r[0] for r in conn.execute("SELECT value FROM items ORDER BY value")]
+    finally:
+        conn.close()
+
+
+def test_failing_op_only_fails_its_own_future(connect):
+    writer = Writer(connect)
+    started, release = threading.Event(), threading.Event()
+
+    def block(conn: sqlite3.Connection) -> bool:
+        started.set()
+        return release.wait(5)
+
+    # Pierwsza partia czeka, a kolejne operacje zbierają się w jedną następną partię
+    blocker = writer.submit(block)
+    assert started.wait(5)
+    futures = [writer.submit(_insert, 1), writer.submit(_fail), writer.submit(_insert, 2)]
+    release.set()
+    wait(futures, timeout=5)
+
+    assert blocker.result() is True
+    assert futures[0].result() and futures[2].result()
+    with pytest.raises(ValueError):
+        futures[1].result()
+    # Zapis nieudanej operacji wycofany (SAVEPOINT), pozostałe w tej samej transakcji
+    assert _values(connect) == [1, 2]
+    assert writer.stats["failed"] == 1
+    assert writer.stats["commits"] == 2
+    writer.close()
+
+
+def test_submit_racing_close_never_leaves_pending_future(connect):
+    def race() -> list:
+        writer = Writer(connect, queue_size=8)
+        futures = []
+
+        def submit_until_closed():
+            while True:
+                try:
+                    futures.append(writer.submit(_insert, 0))
+                except RuntimeError:
+                    return
+
+        submitters = [threading.Thread(target=submit_until_closed) for _ in range(4)]
+        for submitter in submitters:
+            submitter.start()
+        writer.close(5)
+        for submitter in submitters:
+            submitter.join(5)
+        return futures
+
+    # Wyścig jest rzadki - częste przełączanie wątków i wiele prób
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(100):
+            _, pending = wait(race(), timeout=5)
+            assert not pending
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_submit_after_close_raises(connect):
+    writer = Writer(connect)
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit(_insert, 1)
+    # Ponowne zamknięcie niczego nie robi
+    writer.close()
+
+
+def test_flush_waits_for_queued_ops(connect):
+    writer = Writer(connect, max_batch=4)
+    futures = [writer.submit(_insert, value) for value in range(20)]
+    writer.flush(5)
+
+    assert all(future.done() for future in futures)
+    assert _values(connect) == list(range(20))
+    writer.close()
@@ -0,0 +1,154 @@
+"""Pojedynczy wątek zapisu z grupowym commitem (group commit).
+
+Wszystkie zapisy procesu trafiają do kolejki, a jeden wątek wykonuje je na
+jednym połączeniu. Operacje, które zebrały się w kolejce podczas poprzedniego
+commitu, idą razem w jednej transakcji - każda we własnym SAVEPOINT, więc
+błąd jednej nie wycofuje pozostałych. Dzięki temu sesje nie walczą między
+sobą o blokadę zapisu SQLite, a koszt fsync rozkłada się na całą partię.
+
+Wywołujący dostaje Future: może poczekać na commit (`result()`) albo go
+zignorować. Pełna kolejka blokuje `submit` (back-pressure), a `close()`
+- wołane też przy wyjściu z procesu - zapisuje wszystko, co już przyjęto.
+"""
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+logger = logging.getLogger("kanban.writer")
+
+# Ile operacji może czekać w kolejce, zanim submit zacznie blokować
+QUEUE_SIZE = 1024
+# Maksymalna liczba operacji w jednej transakcji
+MAX_BATCH = 256
+
+_STOP = object()
+
+
+class Writer:
+    """Wątek wykonujący operacje `op(conn, *args)` w grupowych transakcjach."""
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        queue_size: int = QUEUE_SIZE,
+        max_batch: int = MAX_BATCH,
+        name: str = "kanban-writer",
+    ) -> None:
+        # Połączenie otwierane od razu (błąd trafia do wywołującego), używane tylko przez wątek
+        self._conn = connect()
+        # Transakcjami sterujemy jawnie (BEGIN IMMEDIATE / SAVEPOINT / COMMIT)
+        self._conn.isolation_level = None
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._max_batch = max_batch
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self.stats = {"operations": 0, "commits": 0, "failed": 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, op: Callable, *args, **kwargs) -> Future:
+        """Zleca `op(conn, *args, **kwargs)`. Future dostaje wynik po commicie.
+
+        Gdy kolejka jest pełna, czeka na miejsce (back-pressure).
+        """
+        if threading.current_thread() is self._thread:
+            # Operacja czekałaby na partię, której sama jest częścią
+            raise RuntimeError("nie można zlecać zapisów z wątku zapisu")
+        future: Future = Future()
+        # Sprawdzenie i wstawienie pod blokadą - nic nie trafi do kolejki za _STOP
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("wątek zapisu jest zamknięty")
+            self._queue.put((future, op, args, kwargs))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Czeka, aż wszystko zlecone do tej pory zostanie zapisane."""
+        self.submit(lambda conn: None).result(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Zapisuje przyjęte operacje i zatrzymuje wątek (idempotentne)."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    # --- Wątek zapisu ---------------------------------------------------------
+
+    def _run(self) -> None:
+        conn = self._conn
+        try:
+            stop = False
+            while not stop:
+                batch = [self._queue.get()]
+                # Wszystko, co nazbierało się w czasie poprzedniego commitu
+                while len(batch) < self._max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if _STOP in batch:
+                    stop = True
+                    batch = [item for item in batch if item is not _STOP]
+                if batch:
+                    self._commit(conn, batch)
+        finally:
+            conn.close()
+            self._fail_remaining()
+
+    def _fail_remaining(self) -> None:
+        """Kończy błędem operacje, które zostały w kolejce po zatrzymaniu wątku."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[0].set_running_or_notify_cancel():
+                item[0].set_exception(RuntimeError("wątek zapisu jest zamknięty"))
+
+    def _commit(self, conn: sqlite3.Connection, batch: list) -> None:
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for future, op, args, kwargs in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT op")
+                try:
+                    result = op(conn, *args, **kwargs)
+                except BaseException as exc:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append((future, None, exc))
+                else:
+                    conn.execute("RELEASE op")
+                    results.append((future, result, None))
+            conn.execute("COMMIT")
+        except Exception as exc:
+            # Nieudany BEGIN/COMMIT - cała partia przepada
+            logger.warning("grupowy commit nie powiódł się: %s", exc)
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            results = [
+                (future, None, exc)
+                for future, *_ in batch
+                if future.running() or future.set_running_or_notify_cancel()
+            ]
+        else:
+            self.stats["commits"] += 1
+
+        for future, result, exc in results:
+            self.stats["operations"] += 1
+            if exc is None:
+                future.set_result(result)
+            else:
+                self.stats["failed"] += 1
+                future.set_exception(exc)